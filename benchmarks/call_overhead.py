@@ -0,0 +1,76 @@
+"""
+Measure the import time of faceit_data and the Python overhead of an endpoint call, without any network I/O.
+
+The client is given a transport that answers every request with a canned body, so what is left is building the URL,
+the request bookkeeping and decoding the JSON.
+
+    python benchmarks/call_overhead.py --calls 20000 --repeat 5
+"""
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, ROOT)
+
+
+class NullTransport:
+    """Answers every request with the same small JSON body"""
+
+    errors = (OSError,)
+
+    def get(self, url, headers, timeout, compressed=False):
+        return 200, {}, b'{"items": []}'
+
+    def close(self):
+        pass
+
+
+def import_time(runs):
+    code = 'import time; started = time.perf_counter(); import faceit_data; print(time.perf_counter() - started)'
+    timings = []
+    for _ in range(runs):
+        output = subprocess.check_output([sys.executable, '-c', code], cwd=ROOT)
+        timings.append(float(output))
+    return min(timings)
+
+
+def call_overhead(calls, repeat=5):
+    from faceit_data import FaceitData
+
+    faceit_data = FaceitData('benchmark', transport=NullTransport())
+    cases = [
+        ('match_details', lambda: faceit_data.match_details('1-00000000-0000-0000-0000-000000000000')),
+        ('championship_matches', lambda: faceit_data.championship_matches('championship', 'past', 100, 20)),
+        ('search_players', lambda: faceit_data.search_players('some nickname', game='cs2', country_code='gb')),
+    ]
+    results = []
+    for name, call in cases:
+        call()
+        best = None
+        for _ in range(repeat):
+            started = time.perf_counter()
+            for _ in range(calls):
+                call()
+            elapsed = time.perf_counter() - started
+            best = elapsed if best is None else min(best, elapsed)
+        results.append((name, best / calls))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().split('\n')[0])
+    parser.add_argument('--calls', type=int, default=20000, help='Calls per endpoint and round')
+    parser.add_argument('--repeat', type=int, default=5, help='Rounds per endpoint, the fastest one is reported')
+    parser.add_argument('--import-runs', type=int, default=5, help='Fresh interpreters to time the import in')
+    args = parser.parse_args()
+
+    print('import faceit_data: {:.1f} ms (best of {})'.format(import_time(args.import_runs) * 1000, args.import_runs))
+    for name, seconds in call_overhead(args.calls, args.repeat):
+        print('{:<22} {:.2f} us per call'.format(name, seconds * 1e6))
+
+
+if __name__ == '__main__':
+    main()
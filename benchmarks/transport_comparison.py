@@ -0,0 +1,204 @@
+"""
+Compare the pooled HTTP/1.1 transport with the HTTP/2 transport at 10, 100 and 500 requests in flight.
+
+Both run against a local stub that speaks HTTP/1.1 and cleartext HTTP/2 (prior knowledge) on the same port and answers
+every request with a small JSON body after a fixed delay, so the numbers show transport overhead and connection usage
+rather than the Faceit API itself.
+
+    pip install requests httpx[http2]
+    python benchmarks/transport_comparison.py --latency 0.02 --requests-per-slot 20
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import h2.config
+import h2.connection
+import h2.events
+import h2.exceptions
+import h2.settings
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from faceit_data import FaceitData, HTTPXTransport, RequestsTransport  # noqa: E402
+
+H2_PREFACE = b'PRI * HTTP/2.0'
+BODY = json.dumps({'match_id': '1-00000000-0000-0000-0000-000000000000', 'status': 'FINISHED'}).encode()
+
+
+class StubServer:
+    """Answers HTTP/1.1 and h2c requests on one port and counts the connections it accepted"""
+
+    def __init__(self, latency):
+        self.latency = latency
+        self.connections = 0
+        self.port = None
+        self._loop = asyncio.new_event_loop()
+        self._ready = threading.Event()
+
+    def start(self):
+        threading.Thread(target=self._run, daemon=True).start()
+        self._ready.wait()
+        return 'http://127.0.0.1:{}/data/v4'.format(self.port)
+
+    def _run(self):
+        asyncio.set_event_loop(self._loop)
+        server = self._loop.run_until_complete(asyncio.start_server(self._handle, '127.0.0.1', 0, backlog=1024))
+        self.port = server.sockets[0].getsockname()[1]
+        self._ready.set()
+        self._loop.run_forever()
+
+    async def _handle(self, reader, writer):
+        self.connections += 1
+        data = await reader.read(65536)
+        try:
+            if data.startswith(H2_PREFACE):
+                await self._handle_h2(reader, writer, data)
+            else:
+                await self._handle_http11(reader, writer, data)
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def _handle_http11(self, reader, writer, data):
+        response = (b'HTTP/1.1 200 OK\r\ncontent-type: application/json\r\ncontent-length: '
+                    + str(len(BODY)).encode() + b'\r\n\r\n' + BODY)
+        while data:
+            while b'\r\n\r\n' not in data:
+                chunk = await reader.read(65536)
+                if not chunk:
+                    return
+                data += chunk
+            _, data = data.split(b'\r\n\r\n', 1)
+            await asyncio.sleep(self.latency)
+            writer.write(response)
+            await writer.drain()
+            if not data:
+                data = await reader.read(65536)
+
+    async def _handle_h2(self, reader, writer, data):
+        connection = h2.connection.H2Connection(config=h2.config.H2Configuration(client_side=False))
+        connection.initiate_connection()
+        connection.update_settings({h2.settings.SettingCodes.MAX_CONCURRENT_STREAMS: 1000})
+        writer.write(connection.data_to_send())
+        # Set whenever the client opens up its flow control windows
+        window_updated = asyncio.Event()
+        responses = {}
+
+        try:
+            while data:
+                for event in connection.receive_data(data):
+                    if isinstance(event, h2.events.RequestReceived):
+                        responses[event.stream_id] = asyncio.ensure_future(
+                            self._respond_h2(connection, writer, event.stream_id, window_updated))
+                        responses[event.stream_id].add_done_callback(
+                            lambda _, stream_id=event.stream_id: responses.pop(stream_id, None))
+                    elif isinstance(event, h2.events.DataReceived):
+                        connection.acknowledge_received_data(event.flow_controlled_length, event.stream_id)
+                    elif isinstance(event, h2.events.WindowUpdated):
+                        window_updated.set()
+                    elif isinstance(event, h2.events.StreamReset):
+                        response = responses.pop(event.stream_id, None)
+                        if response is not None:
+                            response.cancel()
+                    elif isinstance(event, h2.events.ConnectionTerminated):
+                        return
+                writer.write(connection.data_to_send())
+                await writer.drain()
+                data = await reader.read(65536)
+        finally:
+            for response in list(responses.values()):
+                response.cancel()
+
+    async def _respond_h2(self, connection, writer, stream_id, window_updated):
+        await asyncio.sleep(self.latency)
+        try:
+            connection.send_headers(stream_id, [(':status', '200'), ('content-type', 'application/json'),
+                                                ('content-length', str(len(BODY)))])
+            body = BODY
+            while True:
+                # Never send more than the stream and connection windows and the client's frame size allow
+                size = min(len(body), connection.local_flow_control_window(stream_id),
+                           connection.max_outbound_frame_size)
+                if size == 0 and body:
+                    writer.write(connection.data_to_send())
+                    window_updated.clear()
+                    await window_updated.wait()
+                    continue
+                connection.send_data(stream_id, body[:size], end_stream=size == len(body))
+                body = body[size:]
+                writer.write(connection.data_to_send())
+                if not body:
+                    return
+        except (h2.exceptions.StreamClosedError, h2.exceptions.ProtocolError):
+            # The client reset or closed the stream while the response was pending
+            writer.write(connection.data_to_send())
+
+
+def run(server, base_url, transport, in_flight, total):
+    faceit_data = FaceitData('benchmark', transport=transport, negative_cache_ttl=0)
+    faceit_data.base_url = base_url
+    connections = server.connections
+
+    def request(i):
+        started = time.perf_counter()
+        try:
+            ok = faceit_data.fetch('match_details', 'match-{}'.format(i)).ok
+        except Exception:
+            ok = False
+        return time.perf_counter() - started, ok
+
+    # Warm up so the connections are open and the threads started before the clock starts
+    with ThreadPoolExecutor(max_workers=in_flight) as executor:
+        list(executor.map(request, range(in_flight)))
+        started = time.perf_counter()
+        results = list(executor.map(request, range(total)))
+        elapsed = time.perf_counter() - started
+
+    transport.close()
+    # Failed requests are reported on their own, they are left out of the throughput and the latencies
+    latencies = sorted(latency for latency, ok in results if ok) or [float('nan')]
+    succeeded = total - sum(1 for _, ok in results if not ok)
+    return {
+        'requests/s': succeeded / elapsed,
+        'p50 ms': latencies[len(latencies) // 2] * 1000,
+        'p99 ms': latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000,
+        'mean ms': statistics.mean(latencies) * 1000,
+        'connections': server.connections - connections,
+        'failed': total - succeeded,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().split('\n')[0])
+    parser.add_argument('--latency', type=float, default=0.02, help='Seconds the stub waits before answering')
+    parser.add_argument('--requests-per-slot', type=int, default=20, help='Requests sent per request in flight')
+    parser.add_argument('--in-flight', type=int, nargs='+', default=[10, 100, 500])
+    args = parser.parse_args()
+
+    server = StubServer(args.latency)
+    base_url = server.start()
+
+    print('{:<10} {:>9} {:>12} {:>9} {:>9} {:>9} {:>12} {:>7}'.format(
+        'transport', 'in flight', 'requests/s', 'p50 ms', 'p99 ms', 'mean ms', 'connections', 'failed'))
+    for in_flight in args.in_flight:
+        transports = [
+            ('http/1.1', RequestsTransport(pool_maxsize=in_flight)),
+            ('http/2', HTTPXTransport(http2=True, http1=False, max_connections=4)),
+        ]
+        for label, transport in transports:
+            stats = run(server, base_url, transport, in_flight, in_flight * args.requests_per_slot)
+            print('{:<10} {:>9} {:>12.0f} {:>9.1f} {:>9.1f} {:>9.1f} {:>12} {:>7}'.format(
+                label, in_flight, stats['requests/s'], stats['p50 ms'], stats['p99 ms'], stats['mean ms'],
+                stats['connections'], stats['failed']))
+
+
+if __name__ == '__main__':
+    main()
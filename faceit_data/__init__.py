@@ -0,0 +1,41 @@
+from .client import FaceitData
+
+# Everything else is imported on first use, so `import faceit_data` stays cheap for short lived tools
+_LAZY = {
+    'AsyncFaceitData': 'aio',
+    'ArchiveWriter': 'archive',
+    'MatchArchive': 'archive',
+    'HistoryBackfill': 'backfill',
+    'Bracket': 'brackets',
+    'BracketMatch': 'brackets',
+    'Catalog': 'catalog',
+    'CrawlCoordinator': 'crawl',
+    'CrawlJournal': 'crawl',
+    'RateLimiter': 'ratelimit',
+    'BATCH': 'scheduler',
+    'INTERACTIVE': 'scheduler',
+    'PriorityClass': 'scheduler',
+    'Scheduler': 'scheduler',
+    'CircuitBreaker': 'resilience',
+    'CircuitOpenError': 'resilience',
+    'StatsTable': 'stats',
+    'Profiler': 'profiling',
+    'NegativeCache': 'result',
+    'Result': 'result',
+    'HTTPXTransport': 'transport',
+    'RequestsTransport': 'transport',
+}
+
+__all__ = ['FaceitData'] + sorted(_LAZY)
+
+
+def __getattr__(name):
+    module = _LAZY.get(name)
+    if module is None:
+        raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
+
+    from importlib import import_module
+
+    value = getattr(import_module('.' + module, __name__), name)
+    globals()[name] = value
+    return value
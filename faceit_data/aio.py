@@ -0,0 +1,194 @@
+import asyncio
+import time
+
+from .client import ACCEPT_ENCODING, NEGATIVE_CACHE_ENDPOINTS, PAGE_ATTEMPTS, _Pipeline
+from .result import NegativeCache, async_retry
+from .routes import install
+from .transport import httpx_timeout
+
+METHOD_TEMPLATE = '''
+async def {name}(self, {signature}):
+    return await self._get('{name}', _url(self.base_url, {args}), raw)
+'''
+
+PAGINATE_TEMPLATE = '''
+def iter_{name}(self, {signature}):
+    return self._paginate('{name}', lambda offset, limit: _url(self.base_url, {args}),
+                          starting_item_position, return_items, max_items)
+'''
+
+
+class AsyncFaceitData(_Pipeline):
+    """
+    The Data API for Faceit, for asyncio (needs `pip install httpx`, or `httpx[http2]` for HTTP/2)
+
+    The negative cache, circuit breaker, Results and iter_ retries work as in FaceitData. There is no scheduler, no
+    hedging and no profiler, only a rate limiter.
+    """
+
+    def __init__(self, api_token, rate_limiter=None, timeout=(3.05, 15), timeouts=None, circuit_breaker=None,
+                 return_results=False, negative_cache_ttl=300, negative_cache_endpoints=NEGATIVE_CACHE_ENDPOINTS,
+                 http2=False, max_connections=10):
+        """
+        Constructor Keyword arguments:
+
+        :param api_token: The api token used for the Faceit API (either client or server API types)
+        :param rate_limiter: A RateLimiter every request waits on before it is sent, without blocking the event loop
+            (default is None, no limit)
+        :param timeout: The (connect, read) timeout in seconds of every request (default is (3.05, 15))
+        :param timeouts: A dict of endpoint name to a timeout that replaces the default one for that endpoint
+        :param circuit_breaker: A CircuitBreaker that makes requests fail fast with CircuitOpenError while the API is
+            degraded (default is None)
+        :param return_results: Return a Result from every method instead of the data or None (default False)
+        :param negative_cache_ttl: The number of seconds a 404 on an entity lookup is remembered (default 300, 0
+            disables the negative cache)
+        :param negative_cache_endpoints: Names of the endpoints whose 404s are cached (default is
+            NEGATIVE_CACHE_ENDPOINTS)
+        :param http2: Multiplex the requests over HTTP/2 connections (default False)
+        :param max_connections: The maximum number of connections to the API (default 10)
+        """
+
+        self.api_token = api_token
+        self.base_url = 'https://open.faceit.com/data/v4'
+        self.rate_limiter = rate_limiter
+        self.timeout = timeout
+        self.timeouts = dict(timeouts or {})
+        self.circuit_breaker = circuit_breaker
+        self.return_results = return_results
+        self.negative_cache = NegativeCache(negative_cache_ttl) if negative_cache_ttl else None
+        self.negative_cache_endpoints = frozenset(negative_cache_endpoints)
+        self.http2 = http2
+        self.max_connections = max_connections
+
+        self._client = None
+        self._httpx = None
+        self._timeouts = {}
+
+        self.headers = {
+            'accept': 'application/json',
+            'accept-encoding': ACCEPT_ENCODING,
+            'Authorization': 'Bearer {}'.format(self.api_token)
+        }
+
+        self.compressed_headers = dict(self.headers)
+        self.compressed_headers['accept-encoding'] = 'gzip'
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.aclose()
+
+    async def aclose(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def fetch(self, endpoint, *args, **kwargs):
+        """
+        Call an endpoint and get a Result whatever the return_results setting, see FaceitData.fetch
+        """
+
+        raw = kwargs.pop('raw', False)
+        return await self._fetch(endpoint, self._route_url(endpoint, args, kwargs), raw)
+
+    async def batch(self, endpoint, calls, max_concurrency=8):
+        """
+        Call an endpoint for many sets of arguments concurrently, see FaceitData.batch
+
+        :param endpoint: The endpoint name, e.g. 'match_details'
+        :param calls: An iterable of argument tuples, dicts of keyword arguments or single values (e.g. IDs)
+        :param max_concurrency: The number of requests in flight (default 8)
+        :return: A list with what each call returned, in the order of calls
+        """
+
+        method = getattr(self, endpoint)
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def call(args):
+            async with semaphore:
+                if isinstance(args, dict):
+                    return await method(**args)
+                if isinstance(args, tuple):
+                    return await method(*args)
+                return await method(args)
+
+        return await asyncio.gather(*[call(args) for args in calls])
+
+    async def organizer_details(self, name_of_organizer=None, organizer_id=None, raw=False):
+        """
+        Retrieve organizer details, see FaceitData.organizer_details
+        """
+
+        if name_of_organizer is not None:
+            return await self.organizer_details_by_name(name_of_organizer, raw)
+        if organizer_id is not None:
+            return await self.organizer_id_details(organizer_id, raw)
+        raise ValueError('You cannot set name_of_organizer and organizer_id to None. Need to choose one.')
+
+    async def _paginate(self, endpoint, make_url, offset, limit, max_items):
+        count = 0
+        while max_items is None or count < max_items:
+            page_size = limit if max_items is None else min(limit, max_items - count)
+            url = make_url(offset, page_size)
+            items = self._page_items(endpoint, offset,
+                                     await async_retry(lambda: self._fetch(endpoint, url), PAGE_ATTEMPTS))
+            if items is None:
+                return
+
+            for item in items:
+                yield item
+            count += len(items)
+            offset += len(items)
+            if len(items) < page_size:
+                return
+
+    async def _get(self, endpoint, api_url, raw=False):
+        result = await self._fetch(endpoint, api_url, raw)
+        if self.return_results:
+            return result
+        if result.error is not None:
+            raise result.error
+        return result.data
+
+    async def _fetch(self, endpoint, api_url, raw=False):
+        client = self._get_client()
+        result, trial = self._admit(endpoint, api_url)
+        if result is not None:
+            return result
+
+        started = time.monotonic()
+        try:
+            if self.rate_limiter is not None:
+                wait = self.rate_limiter.reserve()
+                if wait > 0:
+                    await asyncio.sleep(wait)
+
+            started = time.monotonic()
+            timeout = httpx_timeout(self._httpx, self.timeouts.get(endpoint, self.timeout), self._timeouts)
+            if raw == 'compressed':
+                async with client.stream('GET', api_url, headers=self.compressed_headers, timeout=timeout) as res:
+                    status, headers = res.status_code, res.headers
+                    body = b''.join([chunk async for chunk in res.aiter_raw()]) if status == 200 else None
+            else:
+                res = await client.get(api_url, headers=self.headers, timeout=timeout)
+                status, headers, body = res.status_code, res.headers, res.content
+        except self._httpx.HTTPError as error:
+            return self._failure(error, started)
+        except BaseException:
+            # Cancelled requests give their trial slot back too
+            self._abandon(trial)
+            raise
+        return self._response(endpoint, api_url, status, headers, body, raw, started)
+
+    def _get_client(self):
+        if self._client is None:
+            import httpx
+
+            self._httpx = httpx
+            limits = httpx.Limits(max_connections=self.max_connections)
+            self._client = httpx.AsyncClient(http2=self.http2, limits=limits)
+        return self._client
+
+
+install(AsyncFaceitData, METHOD_TEMPLATE, PAGINATE_TEMPLATE)
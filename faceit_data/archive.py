@@ -0,0 +1,365 @@
+import json
+import mmap
+import os
+import struct
+import threading
+import time
+
+import numpy as np
+
+from .stats import parse_number
+
+# An archive is a directory of segments, every writer (one per crawl process) appends to segments of its own so no
+# locking is needed. A segment is a .dat file of records (the match ID, then the details and stats JSON bodies), an .idx
+# file with an INDEX_DTYPE entry per record, written last so it is the commit point, and a file per column of
+# COLUMN_DTYPES with a row per player per round. Readers mmap the files and look at them through numpy without copying.
+SEGMENT_SIZE = 256 * 1024 * 1024
+
+RECORD_HEADER = struct.Struct('<III')
+
+INDEX_DTYPE = np.dtype([
+    ('match_id', 'S48'),
+    ('offset', '<u8'),
+    ('details_length', '<u4'),
+    ('stats_length', '<u4'),
+    ('first_row', '<u8'),
+    ('rows', '<u4'),
+    ('finished_at', '<i8'),
+])
+
+# Column name to the player_stats key of match_stats it is parsed from
+STAT_COLUMNS = (
+    ('kills', 'Kills'),
+    ('deaths', 'Deaths'),
+    ('assists', 'Assists'),
+    ('headshots', 'Headshots'),
+    ('headshots_pct', 'Headshots %'),
+    ('kd_ratio', 'K/D Ratio'),
+    ('kr_ratio', 'K/R Ratio'),
+    ('adr', 'ADR'),
+    ('mvps', 'MVPs'),
+    ('triple_kills', 'Triple Kills'),
+    ('quadro_kills', 'Quadro Kills'),
+    ('penta_kills', 'Penta Kills'),
+    ('win', 'Result'),
+)
+
+COLUMN_DTYPES = dict(
+    [('match', np.dtype('<u4')), ('round', np.dtype('u1')), ('player_id', np.dtype('S36'))]
+    + [(name, np.dtype('<f4')) for name, _ in STAT_COLUMNS])
+
+
+def player_rows(stats):
+    """
+    Flatten a match_stats response into one row per player per round
+
+    :param stats: The decoded match_stats response, or None
+    :return: A list of (round, player_id, stat values) tuples, missing stats are NaN
+    """
+
+    rows = []
+    for round_number, match_round in enumerate((stats or {}).get('rounds') or ()):
+        for team in match_round.get('teams') or ():
+            for player in team.get('players') or ():
+                player_stats = player.get('player_stats') or {}
+                values = []
+                for _, key in STAT_COLUMNS:
+                    number = parse_number(player_stats.get(key))
+                    values.append(float('nan') if number is None else number)
+                rows.append((round_number, player.get('player_id') or '', values))
+    return rows
+
+
+class ArchiveWriter:
+    """Appends matches to segments of its own in an archive directory, safe to use from several threads"""
+
+    def __init__(self, path, segment_size=SEGMENT_SIZE, name=None):
+        """
+        Constructor Keyword arguments:
+
+        :param path: The archive directory, created if it does not exist
+        :param segment_size: The size in bytes after which a new segment is started (default 256 MiB)
+        :param name: The prefix of the segments of this writer (default is the start time and the process ID, so the
+            segments sort in the order they were started)
+        """
+
+        self.path = path
+        self.segment_size = segment_size
+        self.name = name or '{:013d}-{}'.format(int(time.time() * 1000), os.getpid())
+        self._sequence = 0
+        self._files = None
+        self._offset = 0
+        self._entries = 0
+        self._rows = 0
+        self._lock = threading.Lock()
+        os.makedirs(path, exist_ok=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        with self._lock:
+            self._close_segment()
+
+    def add(self, match_id, details, stats=None, details_data=None):
+        """
+        Append a match
+
+        The body bytes (raw=True) are stored as they are, decoded responses have to be encoded again first.
+
+        :param match_id: The ID of the match
+        :param details: The match_details response, decoded or as the JSON body bytes
+        :param stats: The match_stats response, decoded or as the JSON body bytes (default is None, no stats yet)
+        :param details_data: The decoded details when details are the body bytes and were decoded already, so they are
+            not parsed again (default is None)
+        """
+
+        if isinstance(details, bytes):
+            details_body = details
+            details = json.loads(details) if details_data is None else details_data
+        else:
+            details_body = json.dumps(details).encode()
+        if isinstance(stats, bytes):
+            stats_body = stats
+            stats = json.loads(stats) if stats else None
+        else:
+            stats_body = b'' if stats is None else json.dumps(stats).encode()
+        key = match_id.encode()
+        if len(key) > INDEX_DTYPE['match_id'].itemsize:
+            raise ValueError('Match ID "{}" is longer than the {} bytes the index holds'.format(
+                match_id, INDEX_DTYPE['match_id'].itemsize))
+        rows = player_rows(stats)
+
+        with self._lock:
+            if self._files is None or self._offset >= self.segment_size:
+                self._open_segment()
+            files = self._files
+
+            files['dat'].write(RECORD_HEADER.pack(len(key), len(details_body), len(stats_body)))
+            files['dat'].write(key)
+            files['dat'].write(details_body)
+            files['dat'].write(stats_body)
+
+            if rows:
+                files['match'].write(np.full(len(rows), self._entries, COLUMN_DTYPES['match']).tobytes())
+                files['round'].write(np.array([row[0] for row in rows], COLUMN_DTYPES['round']).tobytes())
+                files['player_id'].write(np.array([row[1].encode() for row in rows],
+                                                  COLUMN_DTYPES['player_id']).tobytes())
+                values = np.array([row[2] for row in rows], np.float32)
+                for i, (name, _) in enumerate(STAT_COLUMNS):
+                    files[name].write(np.ascontiguousarray(values[:, i]).astype(COLUMN_DTYPES[name]).tobytes())
+
+            entry = np.zeros(1, INDEX_DTYPE)
+            entry['match_id'] = key
+            entry['offset'] = self._offset
+            entry['details_length'] = len(details_body)
+            entry['stats_length'] = len(stats_body)
+            entry['first_row'] = self._rows
+            entry['rows'] = len(rows)
+            entry['finished_at'] = (details or {}).get('finished_at') or 0
+
+            # The data has to be on disk before the index entry that points at it
+            for name, file in files.items():
+                if name != 'idx':
+                    file.flush()
+            files['idx'].write(entry.tobytes())
+            files['idx'].flush()
+
+            self._offset += RECORD_HEADER.size + len(key) + len(details_body) + len(stats_body)
+            self._entries += 1
+            self._rows += len(rows)
+
+    def _open_segment(self):
+        self._close_segment()
+        self._sequence += 1
+        # Segments are never appended to, the offsets in the index count from the start of the segment. The index
+        # file is created exclusively, so a name already used by an earlier writer (or one started in the same
+        # millisecond) moves on to the next sequence number instead
+        while True:
+            prefix = os.path.join(self.path, '{}-{:05d}'.format(self.name, self._sequence))
+            try:
+                index = open(prefix + '.idx', 'xb')
+                break
+            except FileExistsError:
+                self._sequence += 1
+        # Anything else with this prefix was left by a writer that died before its first index entry
+        self._files = {name: open('{}.{}'.format(prefix, name), 'wb') for name in ['dat'] + list(COLUMN_DTYPES)}
+        self._files['idx'] = index
+        self._offset = self._entries = self._rows = 0
+
+    def _close_segment(self):
+        if self._files is not None:
+            for file in self._files.values():
+                file.close()
+            self._files = None
+
+
+class _Segment:
+    """The mmapped files of one segment, only the committed part of them (what the index covers)"""
+
+    def __init__(self, prefix):
+        self.prefix = prefix
+        self._maps = []
+        index = self._map('idx')
+        count = len(index) // INDEX_DTYPE.itemsize
+        self.index = np.frombuffer(index, INDEX_DTYPE, count)
+        rows = int(self.index['first_row'][-1] + self.index['rows'][-1]) if count else 0
+        self.data = memoryview(self._map('dat'))
+        self.columns = {name: np.frombuffer(self._map(name), dtype, rows) for name, dtype in COLUMN_DTYPES.items()}
+
+    def _map(self, extension):
+        with open('{}.{}'.format(self.prefix, extension), 'rb') as file:
+            if os.fstat(file.fileno()).st_size == 0:
+                return b''
+            mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._maps.append(mapped)
+        return mapped
+
+    def record(self, position):
+        entry = self.index[position]
+        start = int(entry['offset']) + RECORD_HEADER.size + len(entry['match_id'])
+        details = self.data[start:start + int(entry['details_length'])]
+        start += int(entry['details_length'])
+        return details, self.data[start:start + int(entry['stats_length'])]
+
+    def close(self):
+        self.index = self.data = self.columns = None
+        for mapped in self._maps:
+            try:
+                mapped.close()
+            except BufferError:
+                # A view handed out earlier is still alive, the map is released together with it
+                pass
+        self._maps = []
+
+
+class MatchArchive:
+    """
+    Reads an archive directory through mmap
+
+    Matches archived more than once (e.g. by two crawls) are looked up by their latest copy, but the columns contain
+    every copy. The archive is read as it was when it was opened, call refresh to see what was added since.
+    """
+
+    def __init__(self, path):
+        """
+        Constructor Keyword arguments:
+
+        :param path: The archive directory
+        """
+
+        self.path = path
+        self.segments = []
+        self._lookup = None
+        self.refresh()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __len__(self):
+        return sum(len(segment.index) for segment in self.segments)
+
+    def __contains__(self, match_id):
+        return match_id in self._index()
+
+    def __iter__(self):
+        """Iterate over the IDs of the archived matches, in the order they were written per segment"""
+
+        for segment in self.segments:
+            for match_id in segment.index['match_id'].tolist():
+                yield match_id.decode()
+
+    def refresh(self):
+        self.close()
+        prefixes = sorted(name[:-4] for name in os.listdir(self.path) if name.endswith('.idx')) \
+            if os.path.isdir(self.path) else []
+        self.segments = [_Segment(os.path.join(self.path, prefix)) for prefix in prefixes]
+
+    def close(self):
+        for segment in self.segments:
+            segment.close()
+        self.segments = []
+        self._lookup = None
+
+    def raw(self, match_id):
+        """
+        :param match_id: The ID of a match
+        :return: A (details, stats) tuple of memoryviews of the JSON bodies, without copying them. stats is empty if
+            the match had no stats when it was archived
+        :raises: KeyError if the match is not in the archive
+        """
+
+        segment, position = self._index()[match_id]
+        return self.segments[segment].record(position)
+
+    def details(self, match_id):
+        """
+        :return: The decoded match_details of a match
+        """
+
+        return json.loads(bytes(self.raw(match_id)[0]))
+
+    def stats(self, match_id):
+        """
+        :return: The decoded match_stats of a match, None if it had none
+        """
+
+        body = self.raw(match_id)[1]
+        return json.loads(bytes(body)) if len(body) else None
+
+    def player_stats(self, match_id):
+        """
+        :return: A dict of column name to an array view of the rows of one match, one row per player per round
+        """
+
+        segment, position = self._index()[match_id]
+        segment = self.segments[segment]
+        first = int(segment.index['first_row'][position])
+        last = first + int(segment.index['rows'][position])
+        return {name: column[first:last] for name, column in segment.columns.items()}
+
+    def column(self, name):
+        """
+        The values of one column over the whole archive
+
+        :param name: A column name, see COLUMN_DTYPES
+        :return: An array, a view of the mmapped file if the archive has a single segment
+        """
+
+        views = list(self.iter_column(name))
+        if len(views) == 1:
+            return views[0]
+        return np.concatenate(views) if views else np.empty(0, COLUMN_DTYPES[name])
+
+    def iter_column(self, name):
+        """
+        :return: A generator of array views of one column, one per segment, without copying anything
+        """
+
+        if name not in COLUMN_DTYPES:
+            raise KeyError('Unknown column "{}"'.format(name))
+        for segment in self.segments:
+            yield segment.columns[name]
+
+    def match_ids(self):
+        """
+        :return: An array of the match ID of every row of the columns, in the same order as column()
+        """
+
+        ids = [segment.index['match_id'][segment.columns['match']] for segment in self.segments]
+        return np.concatenate(ids) if ids else np.empty(0, INDEX_DTYPE['match_id'])
+
+    def _index(self):
+        if self._lookup is None:
+            lookup = {}
+            for i, segment in enumerate(self.segments):
+                for position, match_id in enumerate(segment.index['match_id'].tolist()):
+                    lookup[match_id.decode()] = (i, position)
+            self._lookup = lookup
+        return self._lookup
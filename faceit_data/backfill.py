@@ -0,0 +1,178 @@
+import logging
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from .result import Result, retry
+
+# Nothing on Faceit is older than this, it is where a full history starts
+FACEIT_EPOCH = 1325376000
+
+logger = logging.getLogger(__name__)
+
+
+class _Window:
+    __slots__ = ('player_id', 'start', 'end', 'offset')
+
+    def __init__(self, player_id, start, end, offset=0):
+        self.player_id = player_id
+        self.start = start
+        self.end = end
+        self.offset = offset
+
+
+class _History:
+    __slots__ = ('matches', 'pending', 'error')
+
+    def __init__(self):
+        self.matches = {}
+        self.pending = 0
+        self.error = None
+
+
+class HistoryBackfill:
+    """
+    Pulls the full match history of players by splitting their time range into windows that are fetched concurrently
+
+    A window whose first page comes back full is split into smaller windows instead of being paged through with
+    offsets, so no request goes deep into the history. Only windows shorter than min_window fall back to offsets.
+    """
+
+    def __init__(self, faceit_data, game='cs2', max_workers=8, shards=8, splits=4, page_size=100, min_window=3600,
+                 max_attempts=3):
+        """
+        Constructor Keyword arguments:
+
+        :param faceit_data: The FaceitData client used for the requests (give it a rate limiter or scheduler)
+        :param game: The game whose matches are pulled (default cs2)
+        :param max_workers: The number of requests in flight (default 8)
+        :param shards: The number of windows a player's time range starts as (default 8)
+        :param splits: The number of windows a full window is split into (default 4)
+        :param page_size: The number of matches per request, at most 100 (default 100)
+        :param min_window: Windows shorter than this many seconds are paged through instead of split (default 3600)
+        :param max_attempts: The number of times a request is tried before the player fails (default 3)
+        """
+
+        self.faceit_data = faceit_data
+        self.game = game
+        self.max_workers = max_workers
+        self.shards = max(1, shards)
+        self.splits = max(2, splits)
+        self.page_size = page_size
+        self.min_window = min_window
+        self.max_attempts = max_attempts
+
+    def player(self, player_id, from_timestamp=None, to_timestamp=None):
+        """
+        Pull the match history of one player
+
+        :param player_id: The ID of a player
+        :param from_timestamp: The timestamp (UNIX time) the history starts at (default is FACEIT_EPOCH)
+        :param to_timestamp: The timestamp (UNIX time) the history ends at (default is now)
+        :return: The list of matches, oldest first
+        :raises: The request error, or a RuntimeError with the failing Result, if the history could not be pulled
+        """
+
+        for _, result in self.players([player_id], from_timestamp, to_timestamp):
+            if result.error is not None:
+                raise result.error
+            if not result.ok:
+                raise RuntimeError('Backfill of player {} failed: {!r}'.format(player_id, result))
+            return result.data
+
+    def players(self, player_ids, from_timestamp=None, to_timestamp=None):
+        """
+        Pull the match histories of many players, sharing the workers between them
+
+        :param player_ids: An iterable of player IDs
+        :param from_timestamp: The timestamp (UNIX time) the histories start at (default is FACEIT_EPOCH)
+        :param to_timestamp: The timestamp (UNIX time) the histories end at (default is now)
+        :return: A generator of (player_id, Result) tuples in the order the players finish, the data of a successful
+            Result is the list of matches, oldest first
+        """
+
+        start = FACEIT_EPOCH if from_timestamp is None else int(from_timestamp)
+        end = int(time.time()) if to_timestamp is None else int(to_timestamp)
+        player_ids = iter(player_ids)
+        histories = {}
+        ready = []
+        in_flight = {}
+
+        # Only a few players are started at a time so 10k histories are not all held in memory at once
+        def start_players():
+            while len(histories) < self.max_workers:
+                player_id = next(player_ids, None)
+                if player_id is None:
+                    return
+                if player_id in histories:
+                    continue
+                history = histories[player_id] = _History()
+                for window in self._shard(player_id, start, end):
+                    history.pending += 1
+                    ready.append(window)
+
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='faceit-backfill') as executor:
+            start_players()
+            while ready or in_flight:
+                while ready and len(in_flight) < self.max_workers:
+                    window = ready.pop()
+                    in_flight[executor.submit(self._fetch, window)] = window
+
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    window = in_flight.pop(future)
+                    history = histories[window.player_id]
+                    history.pending -= 1
+                    if history.error is None:
+                        ready.extend(self._handle(window, history, future.result()))
+
+                    if history.pending == 0:
+                        del histories[window.player_id]
+                        yield window.player_id, self._finish(history)
+                start_players()
+
+    def _shard(self, player_id, start, end):
+        step = max(1, -(-(end - start) // self.shards))
+        return [_Window(player_id, lo, min(lo + step, end)) for lo in range(start, end, step)] or \
+            [_Window(player_id, start, end)]
+
+    def _fetch(self, window):
+        def fetch():
+            return self.faceit_data.fetch('player_matches', window.player_id, self.game, window.start, window.end,
+                                          window.offset, self.page_size)
+
+        def on_retry(result, attempt):
+            logger.debug('Window %s-%s of player %s failed (%r), retrying', window.start, window.end,
+                         window.player_id, result)
+
+        return retry(fetch, self.max_attempts, on_retry)
+
+    def _handle(self, window, history, result):
+        """Record a page and return the windows it leads to"""
+
+        if not result.ok:
+            history.error = result
+            return []
+
+        items = result.data.get('items') or ()
+        for match in items:
+            history.matches[match['match_id']] = match
+        if len(items) < self.page_size:
+            return []
+
+        # The window holds more than a page, split it while it is long enough and page through it otherwise
+        if window.end - window.start <= self.min_window:
+            windows = [_Window(window.player_id, window.start, window.end, window.offset + len(items))]
+        else:
+            step = -(-(window.end - window.start) // self.splits)
+            windows = [_Window(window.player_id, lo, min(lo + step, window.end))
+                       for lo in range(window.start, window.end, step)]
+        history.pending += len(windows)
+        return windows
+
+    @staticmethod
+    def _finish(history):
+        if history.error is not None:
+            return history.error
+        matches = sorted(history.matches.values(), key=lambda match: (match.get('started_at') or 0,
+                                                                      match.get('finished_at') or 0))
+        return Result(200, matches)
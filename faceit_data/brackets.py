@@ -0,0 +1,299 @@
+FACTIONS = ('faction1', 'faction2')
+
+FINISHED = 'FINISHED'
+
+
+def _team_id(faction):
+    if not isinstance(faction, dict):
+        return faction or None
+    return faction.get('faction_id') or faction.get('team_id') or faction.get('id') or None
+
+
+class BracketMatch:
+    """One match of a bracket, with the links to the match its winner goes on to"""
+
+    __slots__ = ('match_id', 'round', 'group', 'position', 'status', 'teams', 'winner', 'data', 'next_match',
+                 'next_slot', 'previous')
+
+    def __init__(self, data):
+        """
+        Constructor Keyword arguments:
+
+        :param data: A match of championship_matches, tournament_matches or tournament_brackets
+        """
+
+        self.match_id = data['match_id']
+        self.round = data.get('round')
+        self.group = data.get('group')
+        self.position = data.get('position')
+        self.status = data.get('status')
+        factions = data.get('teams') or data
+        self.teams = {slot: _team_id(factions.get(slot)) for slot in FACTIONS}
+        winner = (data.get('results') or {}).get('winner')
+        self.winner = self.teams.get(winner) if winner in FACTIONS else None
+        self.data = data
+        self.next_match = None
+        self.next_slot = None
+        self.previous = {}
+
+    def __repr__(self):
+        return 'BracketMatch({!r}, round={!r}, group={!r}, status={!r}, teams={!r}, winner={!r})'.format(
+            self.match_id, self.round, self.group, self.status, self.teams, self.winner)
+
+    @property
+    def finished(self):
+        return self.status == FINISHED or self.winner is not None
+
+    def opponent(self, team_id):
+        """
+        :return: The team facing team_id in this match, None if it is not known yet
+        """
+
+        first, second = self.teams['faction1'], self.teams['faction2']
+        return second if first == team_id else first if second == team_id else None
+
+    def expected_teams(self, bracket):
+        """
+        :param bracket: The Bracket this match is part of
+        :return: A dict of slot to the team playing in it, filled in from the winners of the previous matches while the
+            match itself does not name its teams yet
+        """
+
+        teams = dict(self.teams)
+        for slot, previous in self.previous.items():
+            if teams.get(slot) is None:
+                teams[slot] = bracket.matches[previous].winner
+        return teams
+
+
+class Bracket:
+    """
+    The matches of a championship or tournament indexed by round, group, team and status
+
+    Each match is linked to the match its winner plays next. Single elimination rounds (every round half the size of
+    the previous one) whose matches all have a position are linked by position, other rounds are linked as soon as the
+    winner shows up in a later round.
+    Adding or updating a match only re-indexes that match and re-links the rounds around it.
+    """
+
+    def __init__(self, matches=()):
+        """
+        Constructor Keyword arguments:
+
+        :param matches: An iterable of matches of championship_matches, tournament_matches or tournament_brackets
+        """
+
+        self.matches = {}
+        self.by_round = {}
+        self.by_group = {}
+        self.by_team = {}
+        self.by_status = {}
+        self.rankings = {}
+        self._dirty = set()
+        self.update(matches)
+
+    def __len__(self):
+        return len(self.matches)
+
+    def __contains__(self, match_id):
+        return match_id in self.matches
+
+    def __getitem__(self, match_id):
+        self._link()
+        return self.matches[match_id]
+
+    @classmethod
+    def from_championship(cls, faceit_data, championship_id, groups=()):
+        """
+        Fetch every match of a championship, and the ranking of each of its groups
+
+        :param faceit_data: A FaceitData client
+        :param championship_id: The championship ID
+        :param groups: The groups whose championship_group_ranking is fetched too (default is none)
+        :return: A Bracket
+        """
+
+        bracket = cls(faceit_data.iter_championship_matches(championship_id, return_items=100))
+        for group in groups:
+            bracket.set_ranking(group, faceit_data.iter_championship_group_ranking(championship_id, group,
+                                                                                   return_items=100))
+        return bracket
+
+    @classmethod
+    def from_tournament(cls, faceit_data, tournament_id):
+        """
+        Fetch the brackets of a tournament
+
+        :param faceit_data: A FaceitData client
+        :param tournament_id: The tournament ID
+        :return: A Bracket, empty if the tournament has no brackets
+        """
+
+        brackets = faceit_data.tournament_brackets(tournament_id) or {}
+        return cls(brackets.get('matches') or ())
+
+    def update(self, matches):
+        """
+        Add or replace matches, e.g. from a new page of championship_matches
+
+        :param matches: An iterable of matches
+        :return: The list of the added or changed BracketMatch
+        """
+
+        return [self.update_match(data) for data in matches]
+
+    def update_match(self, data):
+        """
+        Add or replace one match, e.g. when its result comes in
+
+        :param data: A match of championship_matches, tournament_matches or tournament_brackets, or match_details
+        :return: The BracketMatch
+        """
+
+        match = BracketMatch(data)
+        old = self.matches.get(match.match_id)
+        if old is not None:
+            # match_details does not know the round and group of the match, keep the ones from the bracket
+            if match.round is None and match.group is None:
+                match.round, match.group, match.position = old.round, old.group, old.position
+            self._unindex(old)
+            match.next_match, match.next_slot, match.previous = old.next_match, old.next_slot, old.previous
+        self.matches[match.match_id] = match
+        self._index(match)
+
+        # Rounds that are not linked by position find the next match by the winner's team, so a new winner or new teams
+        # re-link the rounds on both sides of the match too
+        if old is None or (old.round, old.group, old.position, old.winner, old.teams) != \
+                (match.round, match.group, match.position, match.winner, match.teams):
+            self._dirty.update([(match.group, match.round), (match.group, _previous_round(match.round))])
+        return match
+
+    def set_ranking(self, group, items):
+        """
+        :param group: The group number
+        :param items: The items of championship_group_ranking for that group
+        """
+
+        self.rankings[group] = list(items)
+
+    def rounds(self, group=None):
+        """
+        :param group: Only the matches of this group (default is None, every group)
+        :return: A list of (round, matches) tuples in round order, the matches sorted by position
+        """
+
+        self._link()
+        rounds = []
+        for number in sorted(self.by_round, key=_sort_key):
+            matches = [self.matches[match_id] for match_id in self.by_round[number]]
+            if group is not None:
+                matches = [match for match in matches if match.group == group]
+            if matches:
+                rounds.append((number, sorted(matches, key=lambda match: _sort_key(match.position))))
+        return rounds
+
+    def round(self, number):
+        return self._select(self.by_round.get(number))
+
+    def group(self, group):
+        return self._select(self.by_group.get(group))
+
+    def team(self, team_id):
+        """
+        :return: The matches team_id has played or is set to play, in round order
+        """
+
+        return self._select(self.by_team.get(team_id))
+
+    def status(self, status):
+        return self._select(self.by_status.get(status))
+
+    def next_match(self, team_id):
+        """
+        What's next for a team
+
+        :param team_id: The team (faction) ID
+        :return: The first unfinished match of the team, or the match its last win sends it to when that match does not
+            name its teams yet. None if the team is out or has nothing scheduled
+        """
+
+        matches = self.team(team_id)
+        for match in matches:
+            if not match.finished:
+                return match
+        if matches and matches[-1].winner == team_id and matches[-1].next_match is not None:
+            return self.matches[matches[-1].next_match]
+        return None
+
+    def _select(self, match_ids):
+        self._link()
+        matches = [self.matches[match_id] for match_id in match_ids or ()]
+        return sorted(matches, key=lambda match: (_sort_key(match.round), _sort_key(match.position), match.match_id))
+
+    def _index(self, match):
+        self.by_round.setdefault(match.round, set()).add(match.match_id)
+        self.by_group.setdefault(match.group, set()).add(match.match_id)
+        self.by_status.setdefault(match.status, set()).add(match.match_id)
+        for team_id in match.teams.values():
+            if team_id is not None:
+                self.by_team.setdefault(team_id, set()).add(match.match_id)
+
+    def _unindex(self, match):
+        indexes = [(self.by_round, match.round), (self.by_group, match.group), (self.by_status, match.status)]
+        indexes += [(self.by_team, team_id) for team_id in match.teams.values() if team_id is not None]
+        for index, key in indexes:
+            match_ids = index.get(key)
+            if match_ids is not None:
+                match_ids.discard(match.match_id)
+                if not match_ids:
+                    del index[key]
+
+    def _round_matches(self, group, number):
+        match_ids = self.by_round.get(number, ())
+        matches = [self.matches[match_id] for match_id in match_ids]
+        return sorted([match for match in matches if match.group == group],
+                      key=lambda match: (_sort_key(match.position), match.match_id))
+
+    def _link(self):
+        """Link the matches of the rounds changed since the last lookup to the matches of the round after them"""
+
+        while self._dirty:
+            group, number = self._dirty.pop()
+            if not isinstance(number, int):
+                continue
+            current = self._round_matches(group, number)
+            following = self._round_matches(group, number + 1)
+            for match in current:
+                if match.next_match is not None and match.next_match in self.matches:
+                    self.matches[match.next_match].previous.pop(match.next_slot, None)
+                match.next_match = match.next_slot = None
+
+            # Sorting only puts the matches in bracket order when every one of them has a position
+            positioned = all(match.position is not None for match in current + following)
+            if following and positioned and len(following) == (len(current) + 1) // 2:
+                for i, match in enumerate(current):
+                    self._connect(match, following[i // 2], FACTIONS[i % 2])
+                continue
+
+            for match in current:
+                if match.winner is None:
+                    continue
+                for candidate in following:
+                    for slot, team_id in candidate.teams.items():
+                        if team_id == match.winner:
+                            self._connect(match, candidate, slot)
+
+    @staticmethod
+    def _connect(match, next_match, slot):
+        match.next_match = next_match.match_id
+        match.next_slot = slot
+        next_match.previous[slot] = match.match_id
+
+
+def _previous_round(number):
+    return number - 1 if isinstance(number, int) else None
+
+
+def _sort_key(value):
+    # Rounds and positions are numbers, but a missing one should not break the sort
+    return (value is None, value if isinstance(value, (int, float)) else 0, str(value))
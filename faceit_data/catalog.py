@@ -0,0 +1,350 @@
+import json
+import logging
+import os
+import random
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:
+    # Windows, refreshes are only serialized within the process
+    fcntl = None
+
+# Bumped whenever the layout of the snapshot changes, older snapshots are ignored and fetched again
+SNAPSHOT_VERSION = 1
+
+logger = logging.getLogger(__name__)
+
+
+class Catalog:
+    """
+    The games and organizers of the API, kept in a local snapshot file so workers do not fetch them at every start
+
+    The snapshot is read on the first lookup and the indexes are built the first time they are needed. A snapshot
+    older than refresh_interval is still served while a fresh one is fetched. Refreshes hold a lock file next to the
+    snapshot, so processes sharing the file wait for the one fetching and pick up the snapshot it wrote instead of
+    fetching it again.
+    """
+
+    def __init__(self, faceit_data, path, organizers=(), organizer_names=(), refresh_interval=6 * 3600, jitter=0.1):
+        """
+        Constructor Keyword arguments:
+
+        :param faceit_data: The FaceitData client used to fetch the catalogs
+        :param path: The path of the snapshot file, shared by every worker of a host
+        :param organizers: The IDs of the organizers whose details and games are kept (default is none)
+        :param organizer_names: The names of more organizers to keep, resolved with organizer_details
+        :param refresh_interval: The number of seconds after which the snapshot is fetched again (default 6 hours)
+        :param jitter: The fraction refresh_interval is randomly shortened or lengthened by in the background, so a
+            fleet started at once does not refresh at once (default 0.1)
+        """
+
+        self.faceit_data = faceit_data
+        self.path = path
+        self.organizers = list(organizers)
+        self.organizer_names = list(organizer_names)
+        self.refresh_interval = refresh_interval
+        self.jitter = jitter
+
+        self._snapshot = None
+        self._mtime = None
+        self._indexes = {}
+        self._lock = threading.RLock()
+        self._refresh_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    @property
+    def created_at(self):
+        """The UNIX time the snapshot was fetched at"""
+
+        return self._data()['created_at']
+
+    @property
+    def stale(self):
+        return self._older_than(self.refresh_interval)
+
+    def load(self):
+        """
+        Read the snapshot file if it changed since it was last read
+
+        :return: True if a snapshot is loaded
+        """
+
+        try:
+            mtime = os.stat(self.path).st_mtime
+        except OSError:
+            return self._snapshot is not None
+        if mtime == self._mtime:
+            return True
+
+        try:
+            with open(self.path, encoding='utf-8') as file:
+                snapshot = json.load(file)
+        except (OSError, ValueError):
+            logger.warning('Ignoring unreadable catalog snapshot %s', self.path, exc_info=True)
+            return self._snapshot is not None
+        if snapshot.get('version') != SNAPSHOT_VERSION or snapshot.get('base_url') != self.faceit_data.base_url:
+            return self._snapshot is not None
+
+        with self._lock:
+            self._snapshot, self._mtime, self._indexes = snapshot, mtime, {}
+        return True
+
+    def refresh(self, max_age=None):
+        """
+        Fetch the catalogs and write them to the snapshot file. Entries that fail to fetch keep their previous value
+
+        :param max_age: Only fetch if the snapshot is still older than this many seconds once the lock is held, i.e. no
+            other thread or process refreshed it in the meantime (default is None, always fetch)
+        """
+
+        with self._refresh_lock:
+            self._refresh(max_age)
+
+    def _refresh(self, max_age):
+        # Callers hold _refresh_lock, the lock file serializes the processes sharing the snapshot
+        with self._file_lock():
+            if max_age is not None:
+                self.load()
+                if not self._older_than(max_age):
+                    return
+            self._fetch_snapshot()
+
+    def _fetch_snapshot(self):
+        previous = self._snapshot or {}
+        snapshot = {
+            'version': SNAPSHOT_VERSION,
+            'base_url': self.faceit_data.base_url,
+            'created_at': time.time(),
+            'games': {},
+            'parents': {},
+            'organizers': {},
+            'organizer_games': {},
+        }
+
+        for game in self._all_games():
+            game_id = game['game_id']
+            snapshot['games'][game_id] = self._fetch('game_details', game_id, previous.get('games', {}), game)
+            snapshot['parents'][game_id] = self._fetch('game_details_parent', game_id, previous.get('parents', {}))
+
+        organizer_ids = list(self.organizers)
+        for name in self.organizer_names:
+            result = self.faceit_data.fetch('organizer_details_by_name', name)
+            if result.ok:
+                organizer_ids.append(result.data['organizer_id'])
+                snapshot['organizers'][result.data['organizer_id']] = result.data
+            else:
+                # Keep the organizer this name resolved to last time
+                organizer_ids.extend(organizer_id for organizer_id, organizer in previous.get('organizers', {}).items()
+                                     if organizer and organizer.get('name') == name)
+        for organizer_id in dict.fromkeys(organizer_ids):
+            if organizer_id not in snapshot['organizers']:
+                snapshot['organizers'][organizer_id] = self._fetch('organizer_id_details', organizer_id,
+                                                                   previous.get('organizers', {}))
+            snapshot['organizer_games'][organizer_id] = self._fetch('organizer_games', organizer_id,
+                                                                    previous.get('organizer_games', {}))
+
+        # Write next to the snapshot and rename, readers never see half a file
+        descriptor, temporary = tempfile.mkstemp(suffix='.tmp', prefix=os.path.basename(self.path) + '.',
+                                                 dir=os.path.dirname(self.path) or None)
+        try:
+            with open(descriptor, 'w', encoding='utf-8') as file:
+                json.dump(snapshot, file, separators=(',', ':'))
+            os.replace(temporary, self.path)
+        except BaseException:
+            os.unlink(temporary)
+            raise
+
+        with self._lock:
+            self._snapshot, self._mtime, self._indexes = snapshot, os.stat(self.path).st_mtime, {}
+
+    def start(self):
+        """
+        Keep the snapshot current in a background thread
+
+        :return: The catalog
+        """
+
+        with self._lock:
+            if self._thread is None:
+                self._stop.clear()
+                self._thread = threading.Thread(target=self._run, name='faceit-catalog', daemon=True)
+                self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        thread, self._thread = self._thread, None
+        if thread is not None:
+            thread.join()
+
+    def games(self):
+        """
+        :return: A dict of game ID to its details
+        """
+
+        return self._data()['games']
+
+    def game(self, game_id):
+        """
+        :return: The details of a game, None if there is no such game
+        """
+
+        return self._data()['games'].get(game_id)
+
+    def parent(self, game_id):
+        """
+        :return: The details of the parent of a game, None if it has none
+        """
+
+        return self._data()['parents'].get(game_id)
+
+    def regions(self, game_id):
+        """
+        :return: The list of the regions of a game, empty if there is no such game
+        """
+
+        return self._index('regions', self._build_regions).get(game_id, [])
+
+    def games_in_region(self, region):
+        """
+        :return: The list of the IDs of the games played in a region
+        """
+
+        return self._index('games_by_region', self._build_games_by_region).get(region, [])
+
+    def game_by_label(self, label):
+        """
+        :param label: The short or long label of a game, any case
+        :return: The details of the game, None if there is no such game
+        """
+
+        return self._index('labels', self._build_labels).get(label.lower())
+
+    def organizer(self, organizer_id=None, name=None):
+        """
+        :return: The details of an organizer found by ID or by name, None if it is not in the catalog
+        """
+
+        if organizer_id is not None:
+            return self._data()['organizers'].get(organizer_id)
+        return self._index('organizer_names', self._build_organizer_names).get(name)
+
+    def organizer_games(self, organizer_id):
+        """
+        :return: The organizer_games response of an organizer, None if it is not in the catalog
+        """
+
+        return self._data()['organizer_games'].get(organizer_id)
+
+    def _data(self):
+        snapshot = self._snapshot
+        if snapshot is not None:
+            return snapshot
+        # Waits for a refresh already running in the background thread, and for other processes through the lock file
+        with self._refresh_lock:
+            if self._snapshot is None and not self.load():
+                self._refresh(self.refresh_interval)
+            elif self.stale and self._thread is None:
+                # Serve the old snapshot now and fetch a new one in the background
+                threading.Thread(target=self._refresh_quietly, args=(self.refresh_interval,),
+                                 name='faceit-catalog-refresh', daemon=True).start()
+            return self._snapshot
+
+    def _all_games(self):
+        # Paged by hand, a failed page has to fail the refresh instead of leaving games out of the snapshot
+        games, offset = [], 0
+        while True:
+            result = self.faceit_data.fetch('all_faceit_games', offset, 100)
+            if not result.ok:
+                raise RuntimeError('Fetching the games for the catalog failed: {!r}'.format(result))
+            items = result.data.get('items') or []
+            games.extend(items)
+            offset += len(items)
+            if len(items) < 100:
+                return games
+
+    def _fetch(self, endpoint, key, previous, default=None):
+        result = self.faceit_data.fetch(endpoint, key)
+        if result.ok:
+            return result.data
+        if result.permanent:
+            return default
+        logger.warning('Fetching %s %s for the catalog failed (%r), keeping the previous value', endpoint, key, result)
+        return previous.get(key, default)
+
+    def _run(self):
+        while True:
+            # Drawn once per cycle, the same jittered age decides when to wake up and whether the snapshot is due
+            max_age = self.refresh_interval * random.uniform(1 - self.jitter, 1 + self.jitter)
+            remaining = self._snapshot['created_at'] + max_age - time.time() if self._snapshot is not None else 0
+            if self._stop.wait(max(0, remaining)):
+                return
+            self._refresh_quietly(max_age)
+            # A failed refresh is tried again a minute later
+            if self._older_than(max_age) and self._stop.wait(min(60, self.refresh_interval)):
+                return
+
+    def _refresh_quietly(self, max_age):
+        try:
+            # Skipped if another thread or process sharing the file refreshed it already
+            self.refresh(max_age)
+        except Exception:
+            logger.exception('Refreshing the catalog failed, keeping the current snapshot')
+
+    def _older_than(self, max_age):
+        snapshot = self._snapshot
+        return snapshot is None or time.time() - snapshot['created_at'] > max_age
+
+    @contextmanager
+    def _file_lock(self):
+        if fcntl is None:
+            yield
+            return
+        with open(self.path + '.lock', 'a') as file:
+            # Released when the file is closed
+            fcntl.flock(file, fcntl.LOCK_EX)
+            yield
+
+    def _index(self, name, build):
+        data = self._data()
+        index = self._indexes.get(name)
+        if index is None:
+            index = build(data)
+            # A refresh may have swapped the snapshot while the index was built
+            if data is self._snapshot:
+                self._indexes[name] = index
+        return index
+
+    @staticmethod
+    def _build_regions(data):
+        regions = {}
+        for game_id, game in data['games'].items():
+            # A list of regions, or a dict keyed by region
+            regions[game_id] = list((game or {}).get('regions') or [])
+        return regions
+
+    def _build_games_by_region(self, data):
+        games = {}
+        for game_id, regions in self._index('regions', self._build_regions).items():
+            for region in regions:
+                games.setdefault(region, []).append(game_id)
+        return games
+
+    @staticmethod
+    def _build_labels(data):
+        labels = {}
+        for game in data['games'].values():
+            for key in ('short_label', 'long_label'):
+                if game and game.get(key):
+                    labels.setdefault(game[key].lower(), game)
+        return labels
+
+    @staticmethod
+    def _build_organizer_names(data):
+        return {organizer['name']: organizer for organizer in data['organizers'].values()
+                if organizer and organizer.get('name')}
@@ -0,0 +1,266 @@
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from .client import FaceitData
+from .result import retry
+from .routes import ROUTES_BY_NAME
+
+# Export name to (endpoint, positional arguments, optional keyword arguments)
+EXPORTS = {
+    'hub-members': ('hub_members', ['hub_id'], {}),
+    'championship-matches': ('championship_matches', ['championship_id'], {'type': 'type_of_match'}),
+    'ranking': ('game_global_ranking', ['game_id', 'region'], {'country': 'country'}),
+}
+
+
+class ExportError(Exception):
+    pass
+
+
+class NdjsonWriter:
+    """Writes one JSON document per line"""
+
+    def __init__(self, file):
+        self.file = file
+        self.bytes = 0
+
+    def write(self, items):
+        lines = ''.join(json.dumps(item, separators=(',', ':')) + '\n' for item in items)
+        self.file.write(lines)
+        self.bytes += len(lines.encode('utf-8'))
+
+    def close(self):
+        self.file.flush()
+
+
+class ParquetWriter:
+    """
+    Buffers rows and writes them to a Parquet file a row group at a time (needs `pip install pyarrow`)
+
+    A Parquet file has a single schema, but later pages can bring new keys or values in a column that was all null so
+    far. A row group that does not fit the schema starts a new part file with the widened schema, and close() merges
+    the parts into the output file.
+    """
+
+    def __init__(self, path, row_group_size=10000):
+        import pyarrow
+        import pyarrow.parquet
+
+        self._pyarrow = pyarrow
+        self._parquet = pyarrow.parquet
+        self.path = path
+        self.row_group_size = row_group_size
+        self.bytes = 0
+        self._writer = None
+        self._schema = None
+        self._parts = []
+        self._rows = []
+
+    def write(self, items):
+        self._rows.extend(items)
+        while len(self._rows) >= self.row_group_size:
+            self._flush(self._rows[:self.row_group_size])
+            del self._rows[:self.row_group_size]
+
+    def close(self):
+        try:
+            if self._rows:
+                rows, self._rows = self._rows, []
+                self._flush(rows)
+            if self._writer is not None:
+                self._writer.close()
+                self._writer = None
+                self._merge()
+                self.bytes = os.path.getsize(self.path)
+        except self._pyarrow.ArrowException as error:
+            raise ExportError('Writing {} failed: {}'.format(self.path, error)) from error
+
+    def _flush(self, rows):
+        try:
+            # from_pylist only looks at the keys of the first row
+            names = dict.fromkeys(name for row in rows for name in row)
+            table = self._pyarrow.Table.from_pydict({name: [row.get(name) for row in rows] for name in names})
+            schema = table.schema if self._schema is None else self._pyarrow.unify_schemas(
+                [self._schema, table.schema], promote_options='permissive')
+        except self._pyarrow.ArrowException as error:
+            raise ExportError('The rows do not fit in one Parquet schema: {}'.format(error)) from error
+
+        if self._writer is not None and not schema.equals(self._schema):
+            self._writer.close()
+            self._writer = None
+        if self._writer is None:
+            part = '{}.part{}'.format(self.path, len(self._parts))
+            self._writer = self._parquet.ParquetWriter(part, schema)
+            self._parts.append(part)
+            self._schema = schema
+        self._writer.write_table(self._conform(table, schema))
+
+    def _merge(self):
+        if len(self._parts) == 1:
+            os.replace(self._parts[0], self.path)
+            return
+        # The schema of the last part is the widest, the earlier parts are copied into it a row group at a time
+        with self._parquet.ParquetWriter(self.path, self._schema) as writer:
+            for part in self._parts:
+                with self._parquet.ParquetFile(part) as file:
+                    for i in range(file.num_row_groups):
+                        writer.write_table(self._conform(file.read_row_group(i), self._schema))
+                os.remove(part)
+        self._parts = [self.path]
+
+    def _conform(self, table, schema):
+        # Missing columns are filled with nulls, null columns and narrower types are cast
+        columns = [table.column(field.name).cast(field.type) if field.name in table.column_names
+                   else self._pyarrow.nulls(len(table), field.type) for field in schema]
+        return self._pyarrow.Table.from_arrays(columns, schema=schema)
+
+
+def export(faceit_data, endpoint, args, kwargs, writer, concurrency=4, page_size=100, max_items=None,
+           max_attempts=3, summary=None):
+    """
+    Stream every page of a paginated endpoint to a writer, fetching up to concurrency pages at once
+
+    Pages are written in order and at most concurrency pages are held in memory. The export stops at the first page
+    that comes back short.
+
+    :param summary: A dict the numbers of items, pages and retried requests are counted in, it is up to date even if
+        the export fails half way (default is a new dict)
+    :return: The summary
+    """
+
+    items_key = ROUTES_BY_NAME[endpoint].items_key
+    if summary is None:
+        summary = {}
+    for key in ('items', 'pages', 'retries'):
+        summary.setdefault(key, 0)
+
+    def fetch(offset):
+        limit = page_size if max_items is None else min(page_size, max_items - offset)
+
+        def count_retry(result, attempt):
+            summary['retries'] += 1
+
+        result = retry(lambda: faceit_data.fetch(endpoint, *args, starting_item_position=offset, return_items=limit,
+                                                 **kwargs), max_attempts, count_retry)
+        if not result.ok:
+            raise ExportError('Page at offset {} failed: {!r}'.format(offset, result))
+        return limit, result.data.get(items_key) or []
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        pending = []
+        next_offset = 0
+        done = False
+        while not done:
+            while len(pending) < concurrency and (max_items is None or next_offset < max_items):
+                pending.append(executor.submit(fetch, next_offset))
+                next_offset += page_size
+            if not pending:
+                break
+
+            limit, items = pending.pop(0).result()
+            writer.write(items)
+            summary['items'] += len(items)
+            summary['pages'] += 1
+            done = len(items) < limit
+        for future in pending:
+            future.cancel()
+    return summary
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='python -m faceit_data', description='Command line tools for the Faceit '
+                                     'Data API')
+    commands = parser.add_subparsers(dest='command', required=True)
+    export_parser = commands.add_parser('export', help='Stream every page of a list endpoint to NDJSON or Parquet')
+    targets = export_parser.add_subparsers(dest='target', required=True)
+
+    def add_target(name, help_text, positionals, options):
+        target = targets.add_parser(name, help=help_text)
+        for positional in positionals:
+            target.add_argument(positional)
+        for option, help_option in options:
+            target.add_argument('--' + option, help=help_option)
+        target.add_argument('-o', '--output', help='The file to write, "-" or none for stdout (NDJSON only)')
+        target.add_argument('--format', choices=('ndjson', 'parquet'),
+                            help='The output format (default is parquet for .parquet files, NDJSON otherwise)')
+        target.add_argument('--token', default=os.environ.get('FACEIT_API_KEY'),
+                            help='The API token (default is the FACEIT_API_KEY environment variable)')
+        target.add_argument('--concurrency', type=int, default=4, help='Pages fetched at once (default 4)')
+        target.add_argument('--page-size', type=int, default=100, help='Items per request (default 100)')
+        target.add_argument('--max-items', type=int, help='Stop after this many items')
+        target.add_argument('--rate', type=float, help='Requests per second allowed (default is no limit)')
+        target.add_argument('--row-group-size', type=int, default=10000,
+                            help='Rows per Parquet row group (default 10000)')
+
+    add_target('hub-members', 'The members of a hub', ['hub_id'], [])
+    add_target('championship-matches', 'The matches of a championship', ['championship_id'],
+               [('type', 'all (default), upcoming, ongoing or past')])
+    add_target('ranking', 'The global ranking of a game in a region', ['game_id', 'region'],
+               [('country', 'A country code (ISO 3166-1)')])
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if not args.token:
+        print('An API token is needed, pass --token or set FACEIT_API_KEY', file=sys.stderr)
+        return 2
+
+    endpoint, positionals, options = EXPORTS[args.target]
+    output = None if args.output in (None, '-') else args.output
+    output_format = args.format or ('parquet' if output and output.endswith('.parquet') else 'ndjson')
+
+    rate_limiter = None
+    if args.rate:
+        from .ratelimit import RateLimiter
+
+        rate_limiter = RateLimiter(args.rate, burst=max(1, args.concurrency))
+    faceit_data = FaceitData(args.token, rate_limiter=rate_limiter)
+
+    if output_format == 'parquet':
+        if output is None:
+            print('Parquet needs an --output file', file=sys.stderr)
+            return 2
+        try:
+            writer = ParquetWriter(output, args.row_group_size)
+        except ImportError:
+            print('Parquet output needs pyarrow, `pip install pyarrow`', file=sys.stderr)
+            return 2
+        file = None
+    else:
+        file = sys.stdout if output is None else open(output, 'w', encoding='utf-8')
+        writer = NdjsonWriter(file)
+
+    started = time.monotonic()
+    status = 0
+    summary = {'items': 0, 'pages': 0, 'retries': 0}
+    try:
+        kwargs = {keyword: getattr(args, option) for option, keyword in options.items()
+                  if getattr(args, option) is not None}
+        export(faceit_data, endpoint, [getattr(args, name) for name in positionals], kwargs, writer,
+               args.concurrency, args.page_size, args.max_items, summary=summary)
+    except (ExportError, OSError) as error:
+        print(error, file=sys.stderr)
+        status = 1
+    except KeyboardInterrupt:
+        status = 130
+    finally:
+        try:
+            writer.close()
+        except (ExportError, OSError) as error:
+            # The summary still tells how far the export got
+            print(error, file=sys.stderr)
+            status = status or 1
+        if file is not None and file is not sys.stdout:
+            file.close()
+        faceit_data.transport.close()
+
+    elapsed = time.monotonic() - started
+    print('{} items in {} pages ({} retries) in {:.1f}s, {:.0f} items/s, {:.1f} pages/s, {:.1f} MB written'.format(
+        summary['items'], summary['pages'], summary['retries'], elapsed, summary['items'] / max(elapsed, 1e-9),
+        summary['pages'] / max(elapsed, 1e-9), writer.bytes / 1e6), file=sys.stderr)
+    return status
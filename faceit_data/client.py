@@ -0,0 +1,407 @@
+import copy
+import json
+import threading
+import time
+
+from .resilience import CircuitOpenError, LatencyTracker
+from .result import NegativeCache, Result, parse_retry_after, retry
+from .routes import ROUTES_BY_NAME, install
+from .transport import make_transport
+
+try:
+    import brotli  # noqa: F401 - lets the transports decode "br" bodies
+    ACCEPT_ENCODING = 'br, gzip, deflate'
+except ImportError:
+    try:
+        import brotlicffi  # noqa: F401
+        ACCEPT_ENCODING = 'br, gzip, deflate'
+    except ImportError:
+        ACCEPT_ENCODING = 'gzip, deflate'
+
+METHOD_TEMPLATE = '''
+def {name}(self, {signature}):
+    return self._get('{name}', _url(self.base_url, {args}), raw)
+'''
+
+PAGINATE_TEMPLATE = '''
+def iter_{name}(self, {signature}):
+    return self._paginate('{name}', lambda offset, limit: _url(self.base_url, {args}),
+                          starting_item_position, return_items, max_items)
+'''
+
+# Tries at a page of an iter_ method that failed with a timeout, rate limit or server error
+PAGE_ATTEMPTS = 3
+
+# Lookups of a single entity by ID, a 404 on these means the entity does not exist
+NEGATIVE_CACHE_ENDPOINTS = frozenset([
+    'championship_details', 'hub_details', 'match_details', 'player_id_details', 'team_details', 'tournament_details',
+])
+
+
+class _Pipeline:
+    """
+    What FaceitData and AsyncFaceitData do around sending a request: the negative cache, the circuit breaker and
+    turning the response into a Result
+    """
+
+    def _route_url(self, endpoint, args, kwargs):
+        route = ROUTES_BY_NAME.get(endpoint)
+        if route is None:
+            raise ValueError('Unknown endpoint "{}"'.format(endpoint))
+        return route.url(self.base_url, *args, **kwargs)
+
+    def _admit(self, endpoint, api_url):
+        """
+        :return: A (result, trial) tuple. result is a Result to return without sending the request when the negative
+            cache or the circuit breaker answers it, trial is True when the request holds a half-open trial slot
+        """
+
+        if (self.negative_cache is not None and endpoint in self.negative_cache_endpoints
+                and api_url in self.negative_cache):
+            return Result(404, cached=True), False
+        if self.circuit_breaker is None:
+            return None, False
+        try:
+            return None, self.circuit_breaker.before_request()
+        except CircuitOpenError as error:
+            return Result(None, retry_after=error.retry_in, error=error), False
+
+    def _abandon(self, trial):
+        # Neither a success nor a failure was recorded, the trial slot would stay taken
+        if trial:
+            self.circuit_breaker.release()
+
+    def _failure(self, error, started):
+        if self.circuit_breaker is not None:
+            self.circuit_breaker.record_failure()
+        return Result(None, elapsed=time.monotonic() - started, error=error)
+
+    def _response(self, endpoint, api_url, status, headers, body, raw, started, trace=None):
+        elapsed = time.monotonic() - started
+        if self.circuit_breaker is not None:
+            if status >= 500:
+                self.circuit_breaker.record_failure()
+            else:
+                self.circuit_breaker.record_success()
+
+        if status == 200:
+            if raw:
+                return Result(200, body, elapsed=elapsed)
+            if trace is None:
+                return Result(200, json.loads(body), elapsed=elapsed)
+            decoding = time.perf_counter()
+            data = json.loads(body)
+            trace.add('decode', decoding, time.perf_counter())
+            return Result(200, data, elapsed=elapsed)
+
+        if status == 404 and self.negative_cache is not None and endpoint in self.negative_cache_endpoints:
+            self.negative_cache.add(api_url)
+        return Result(status, retry_after=parse_retry_after(headers.get('retry-after')), elapsed=elapsed)
+
+    def _page_items(self, endpoint, offset, result):
+        """
+        :return: The items of a page of an iter_ method, or None when the iteration ends
+        """
+
+        # A page that still failed after its retries fails the iteration
+        if result.transient:
+            if result.error is not None:
+                raise result.error
+            raise RuntimeError('Fetching a page of {} at offset {} failed: {!r}'.format(endpoint, offset, result))
+        # A missing entity or bad parameters fail the same way on every page, the iteration just ends
+        if not result.ok:
+            return None
+        return result.data.get(ROUTES_BY_NAME[endpoint].items_key) or ()
+
+
+class FaceitData(_Pipeline):
+    """The Data API for Faceit"""
+
+    def __init__(self, api_token, rate_limiter=None, scheduler=None, timeout=(3.05, 15), timeouts=None,
+                 hedge_endpoints=(), hedge_after=None, circuit_breaker=None, return_results=False,
+                 negative_cache_ttl=300, negative_cache_endpoints=NEGATIVE_CACHE_ENDPOINTS, transport='requests',
+                 profiler=None):
+        """
+        Constructor Keyword arguments:
+
+        :param api_token: The api token used for the Faceit API (either client or server API types)
+        :param rate_limiter: A RateLimiter every request waits on before it is sent (default is None, no limit)
+        :param scheduler: A Scheduler that queues requests by priority class, it replaces rate_limiter
+            (default is None)
+        :param timeout: The (connect, read) timeout in seconds of every request (default is (3.05, 15))
+        :param timeouts: A dict of endpoint name to a timeout that replaces the default one for that endpoint
+        :param hedge_endpoints: Names of endpoints to hedge: if no reply came after hedge_after, a duplicate request is
+            sent and the first reply wins (default is none, e.g. ('match_details', 'match_stats'))
+        :param hedge_after: The number of seconds before hedging (default is None, the endpoint's p95 latency)
+        :param circuit_breaker: A CircuitBreaker that makes requests fail fast with CircuitOpenError while the API is
+            degraded (default is None)
+        :param return_results: Return a Result with the status, retry hint and timing from every method instead of
+            the data or None, errors are returned in the Result instead of raised (default False)
+        :param negative_cache_ttl: The number of seconds a 404 on an entity lookup is remembered and answered
+            without a request (default 300, 0 disables the negative cache)
+        :param negative_cache_endpoints: Names of the endpoints whose 404s are cached (default is
+            NEGATIVE_CACHE_ENDPOINTS)
+        :param transport: 'requests' for pooled HTTP/1.1, 'http2' for HTTP/2 through httpx, or a transport instance
+            such as HTTPXTransport(max_connections=4) (default is 'requests')
+        :param profiler: A Profiler that records the rate limiter waits and the phases of every request (default is
+            None, no profiling)
+        """
+
+        self.api_token = api_token
+        self.base_url = 'https://open.faceit.com/data/v4'
+        self.rate_limiter = rate_limiter
+        self.scheduler = scheduler
+        self.timeout = timeout
+        self.timeouts = dict(timeouts or {})
+        self.hedge_endpoints = frozenset(hedge_endpoints)
+        self.hedge_after = hedge_after
+        self.circuit_breaker = circuit_breaker
+        self.latency = LatencyTracker()
+        self.return_results = return_results
+        self.negative_cache = NegativeCache(negative_cache_ttl) if negative_cache_ttl else None
+        self.negative_cache_endpoints = frozenset(negative_cache_endpoints)
+        self.profiler = profiler
+
+        # The HTTP stack is only imported once the first request is sent
+        self._transport = None
+        self._transport_spec = transport
+        self._lock = threading.Lock()
+        self._hedge_executor = None
+
+        self.headers = {
+            'accept': 'application/json',
+            'accept-encoding': ACCEPT_ENCODING,
+            'Authorization': 'Bearer {}'.format(self.api_token)
+        }
+
+        # Raw "compressed" bodies are only ever gzip (or identity), so archived payloads stay self-describing
+        self.compressed_headers = dict(self.headers)
+        self.compressed_headers['accept-encoding'] = 'gzip'
+
+    @property
+    def transport(self):
+        if self._transport is None:
+            with self._lock:
+                if self._transport is None:
+                    self._transport = make_transport(self._transport_spec)
+        return self._transport
+
+    @transport.setter
+    def transport(self, transport):
+        self._transport = make_transport(transport)
+
+    def with_results(self):
+        """
+        Get a view of this client whose methods return a Result instead of the data or None
+
+        :return: A FaceitData sharing the rate limiter, scheduler, circuit breaker, transport and caches of this one
+        """
+
+        # Create the transport first so the view does not end up with its own
+        self.transport
+        view = copy.copy(self)
+        view.return_results = True
+        return view
+
+    def catalog(self, path, **kwargs):
+        """
+        Get the games and organizers from a local snapshot file that is refreshed in the background
+
+        :param path: The path of the snapshot file, shared by every worker of a host
+        :param kwargs: See Catalog, e.g. organizers=[organizer_id, ...]
+        :return: A started Catalog
+        """
+
+        from .catalog import Catalog
+
+        return Catalog(self, path, **kwargs).start()
+
+    def fetch(self, endpoint, *args, **kwargs):
+        """
+        Call an endpoint and get a Result whatever the return_results setting
+
+        :param endpoint: The endpoint name, e.g. 'match_details'
+        :param args: The arguments of the endpoint method, raw included
+        :param kwargs: The keyword arguments of the endpoint method, raw included
+        :return: A Result
+        """
+
+        raw = kwargs.pop('raw', False)
+        return self._fetch(endpoint, self._route_url(endpoint, args, kwargs), raw)
+
+    def batch(self, endpoint, calls, max_workers=8):
+        """
+        Call an endpoint for many sets of arguments concurrently
+
+        :param endpoint: The endpoint name, e.g. 'match_details'
+        :param calls: An iterable of argument tuples, dicts of keyword arguments or single values (e.g. IDs)
+        :param max_workers: The number of requests in flight (default 8)
+        :return: A list with what each call returned, in the order of calls. Use with_results() to get failures as
+            Results instead of the first error being raised
+        """
+
+        from concurrent.futures import ThreadPoolExecutor
+
+        method = getattr(self, endpoint)
+
+        def call(args):
+            if isinstance(args, dict):
+                return method(**args)
+            if isinstance(args, tuple):
+                return method(*args)
+            return method(args)
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(call, calls))
+
+    def _paginate(self, endpoint, make_url, offset, limit, max_items):
+        count = 0
+        while max_items is None or count < max_items:
+            page_size = limit if max_items is None else min(limit, max_items - count)
+            url = make_url(offset, page_size)
+            items = self._page_items(endpoint, offset, retry(lambda: self._fetch(endpoint, url), PAGE_ATTEMPTS))
+            if items is None:
+                return
+
+            for item in items:
+                yield item
+            count += len(items)
+            offset += len(items)
+            if len(items) < page_size:
+                return
+
+    def _get(self, endpoint, api_url, raw=False):
+        """
+        Perform a GET request against the Data API
+
+        :param endpoint: The name of the method making the request
+        :param api_url: The full URL of the endpoint
+        :param raw: False to decode the JSON body, True for the decompressed body bytes, 'compressed' for the body
+            bytes exactly as transferred (gzip or identity, check for the b'\\x1f\\x8b' magic)
+        :return: A Result if return_results is set, otherwise the decoded JSON, the body bytes or None if the
+            request failed
+        """
+
+        result = self._fetch(endpoint, api_url, raw)
+        if self.return_results:
+            return result
+        if result.error is not None:
+            raise result.error
+        return result.data
+
+    def _fetch(self, endpoint, api_url, raw=False):
+        """
+        Perform a GET request and describe its outcome without raising
+
+        :param endpoint: The name of the method making the request
+        :param api_url: The full URL of the endpoint
+        :param raw: See _get
+        :return: A Result
+        """
+
+        if self.profiler is None:
+            return self._request(endpoint, api_url, raw)
+        trace = self.profiler.request(endpoint)
+        result = self._request(endpoint, api_url, raw, trace)
+        trace.finish(result)
+        return result
+
+    def _request(self, endpoint, api_url, raw, trace=None):
+        result, trial = self._admit(endpoint, api_url)
+        if result is not None:
+            return result
+
+        started = time.monotonic()
+        try:
+            if self.scheduler is not None:
+                with self.scheduler.slot(self.scheduler.classify(endpoint)):
+                    if trace is not None:
+                        trace.add('rate_limit', trace.started, time.perf_counter())
+                    status, headers, body = self._call(endpoint, api_url, raw, trace)
+            else:
+                if self.rate_limiter is not None:
+                    self.rate_limiter.acquire()
+                    if trace is not None:
+                        trace.add('rate_limit', trace.started, time.perf_counter())
+                status, headers, body = self._call(endpoint, api_url, raw, trace)
+        except self.transport.errors as error:
+            return self._failure(error, started)
+        except BaseException:
+            self._abandon(trial)
+            raise
+        return self._response(endpoint, api_url, status, headers, body, raw, started, trace)
+
+    def _call(self, endpoint, api_url, raw, trace=None):
+        timeout = self.timeouts.get(endpoint, self.timeout)
+        hedged = endpoint in self.hedge_endpoints
+        hedge_after = None
+        if hedged:
+            hedge_after = self.hedge_after if self.hedge_after is not None else self.latency.percentile(endpoint)
+
+        started = time.monotonic()
+        if hedge_after is None:
+            status, headers, body = self._send(api_url, raw, timeout, trace)
+        else:
+            status, headers, body = self._send_hedged(api_url, raw, timeout, hedge_after, trace)
+        if hedged:
+            self.latency.record(endpoint, time.monotonic() - started)
+        return status, headers, body
+
+    def _send(self, api_url, raw, timeout, trace=None):
+        # Transports only get a trace callback while profiling, so custom transports without one keep working
+        if trace is not None:
+            if raw == 'compressed':
+                return self.transport.get(api_url, self.compressed_headers, timeout, compressed=True, trace=trace.add)
+            return self.transport.get(api_url, self.headers, timeout, trace=trace.add)
+        if raw == 'compressed':
+            return self.transport.get(api_url, self.compressed_headers, timeout, compressed=True)
+        return self.transport.get(api_url, self.headers, timeout)
+
+    def _send_hedged(self, api_url, raw, timeout, hedge_after, trace=None):
+        from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+        with self._lock:
+            if self._hedge_executor is None:
+                self._hedge_executor = ThreadPoolExecutor(max_workers=64, thread_name_prefix='faceit-hedge')
+        executor = self._hedge_executor
+
+        primary = executor.submit(self._send, api_url, raw, timeout, trace)
+        done, _ = wait([primary], timeout=hedge_after)
+        if done:
+            return primary.result()
+
+        # A duplicate costs budget too, only hedge when the rate limiter has a slot free right now
+        rate_limiter = self.scheduler.rate_limiter if self.scheduler is not None else self.rate_limiter
+        if rate_limiter is not None and rate_limiter.try_acquire() != 0.0:
+            return primary.result()
+
+        pending = [primary, executor.submit(self._send, api_url, raw, timeout, trace)]
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None and future.result()[0] < 500:
+                    return future.result()
+        return primary.result()
+
+    # Organizers
+    def organizer_details(self, name_of_organizer=None, organizer_id=None, raw=False):
+        """
+        Retrieve organizer details
+
+        :param name_of_organizer: The name of organizer (use either this, or the organizer_id)
+        :param organizer_id: The ID of the organizer (use either this, or the name_of_organizer)
+        :param raw: Return the undecoded body bytes instead of JSON, or 'compressed' for the
+            bytes exactly as transferred
+        :return:
+        """
+
+        if name_of_organizer is not None:
+            return self.organizer_details_by_name(name_of_organizer, raw)
+        if organizer_id is not None:
+            return self.organizer_id_details(organizer_id, raw)
+        raise ValueError('You cannot set name_of_organizer and organizer_id to None. Need to choose one.')
+
+
+# Every other endpoint method, and its iter_ variant when it is paginated, is generated from the route table
+install(FaceitData, METHOD_TEMPLATE, PAGINATE_TEMPLATE)
+
@@ -0,0 +1,427 @@
+import json
+import logging
+import multiprocessing
+import os
+import sqlite3
+import time
+from contextlib import nullcontext
+
+from .client import FaceitData
+from .ratelimit import RateLimiter
+from .result import backoff
+
+PENDING = 0
+CLAIMED = 1
+DONE = 2
+FAILED = 3
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_FETCHERS = {
+    'player': 'player_id_details',
+    'match': 'match_details',
+    'championship': 'championship_details',
+}
+
+
+class CrawlJournal:
+    """A SQLite work queue that doubles as the journal of completed items, safe to share between processes"""
+
+    def __init__(self, path):
+        """
+        Constructor Keyword arguments:
+
+        :param path: The path of the journal database, created if it does not exist
+        """
+
+        self.path = path
+        self.connection = sqlite3.connect(path, timeout=60, isolation_level=None)
+        self.connection.execute('PRAGMA journal_mode=WAL')
+        self.connection.execute('PRAGMA synchronous=NORMAL')
+        self.connection.execute(
+            'CREATE TABLE IF NOT EXISTS items ('
+            'kind TEXT NOT NULL, item_id TEXT NOT NULL, state INTEGER NOT NULL DEFAULT 0, '
+            'attempts INTEGER NOT NULL DEFAULT 0, claimed_by INTEGER, updated_at REAL, '
+            'transient_attempts INTEGER NOT NULL DEFAULT 0, last_transient INTEGER NOT NULL DEFAULT 0, '
+            'PRIMARY KEY (kind, item_id))')
+        # Journals written before transient failures were counted apart
+        columns = {row[1] for row in self.connection.execute('PRAGMA table_info(items)')}
+        for column in ('transient_attempts', 'last_transient'):
+            if column not in columns:
+                self.connection.execute('ALTER TABLE items ADD COLUMN {} INTEGER NOT NULL DEFAULT 0'.format(column))
+        self.connection.execute('CREATE INDEX IF NOT EXISTS items_state ON items (state)')
+        self.connection.execute('CREATE INDEX IF NOT EXISTS items_state_attempts ON items (state, attempts)')
+
+    def close(self):
+        self.connection.close()
+
+    def add(self, items):
+        """
+        Queue work items, items that are already queued or completed are ignored
+
+        :param items: An iterable of (kind, item_id) tuples
+        :return: The number of newly queued items
+        """
+
+        with self._transaction() as cursor:
+            return self._insert(cursor, items)
+
+    def claim(self, worker, count):
+        """
+        Claim pending items for a worker
+
+        :param worker: The ID of the claiming worker (its process ID)
+        :param count: The maximum number of items to claim
+        :return: A list of (kind, item_id) tuples
+        """
+
+        with self._transaction() as cursor:
+            # Fresh items go first. An item that failed or was claimed by a crashed worker is claimed on its own, so
+            # if it crashes the worker again only its own attempts are counted
+            rows = cursor.execute('SELECT kind, item_id, attempts FROM items WHERE state = ? '
+                                  'ORDER BY attempts, rowid LIMIT ?', (PENDING, count)).fetchall()
+            if rows and rows[0][2] > 0:
+                rows = rows[:1]
+            rows = [(kind, item_id) for kind, item_id, _ in rows]
+            cursor.executemany('UPDATE items SET state = ?, claimed_by = ?, updated_at = ? '
+                               'WHERE kind = ? AND item_id = ?',
+                               [(CLAIMED, worker, time.time(), kind, item_id) for kind, item_id in rows])
+        return rows
+
+    def complete(self, kind, item_id, discovered=()):
+        """
+        Mark an item as done and queue the items found while processing it, in one transaction
+
+        :param kind: The kind of the item
+        :param item_id: The ID of the item
+        :param discovered: An iterable of (kind, item_id) tuples to queue
+        """
+
+        with self._transaction() as cursor:
+            self._insert(cursor, discovered)
+            cursor.execute('UPDATE items SET state = ?, claimed_by = NULL, updated_at = ? '
+                           'WHERE kind = ? AND item_id = ?',
+                           (DONE, time.time(), kind, item_id))
+
+    def fail(self, kind, item_id, max_attempts, permanent=False, transient=False):
+        """
+        Record a failed attempt, the item is queued again until it has failed max_attempts times
+
+        :param kind: The kind of the item
+        :param item_id: The ID of the item
+        :param max_attempts: The number of attempts before the item is given up on, transient failures are counted
+            apart from the others
+        :param permanent: Give up on the item right away, e.g. when it does not exist (default False)
+        :param transient: The failure may go away by itself (timeout, rate limit, server error). An item given up on
+            after transient failures is queued again by requeue_failed (default False)
+        """
+
+        if permanent:
+            max_attempts = 0
+        column = 'transient_attempts' if transient else 'attempts'
+        with self._transaction() as cursor:
+            cursor.execute('UPDATE items SET {0} = {0} + 1, last_transient = ?, claimed_by = NULL, updated_at = ?, '
+                           'state = CASE WHEN {0} + 1 >= ? THEN ? ELSE ? END '
+                           'WHERE kind = ? AND item_id = ?'.format(column),
+                           (int(transient), time.time(), max_attempts, FAILED, PENDING, kind, item_id))
+
+    def requeue_failed(self, transient_only=True):
+        """
+        Queue failed items again, e.g. once the API is back after an outage
+
+        :param transient_only: Only the items whose last failure was transient (default True)
+        :return: The number of queued items
+        """
+
+        with self._transaction() as cursor:
+            if transient_only:
+                cursor.execute('UPDATE items SET state = ?, transient_attempts = 0, updated_at = ? '
+                               'WHERE state = ? AND last_transient = 1', (PENDING, time.time(), FAILED))
+            else:
+                cursor.execute('UPDATE items SET state = ?, attempts = 0, transient_attempts = 0, updated_at = ? '
+                               'WHERE state = ?', (PENDING, time.time(), FAILED))
+            return cursor.rowcount
+
+    def release(self, worker=None, max_attempts=None):
+        """
+        Put claimed items back in the queue, used to recover from crashed workers
+
+        :param worker: Only release the items claimed by this worker (default is None, release everything)
+        :param max_attempts: Count the release as a failed attempt of every released item, and give up on the items
+            that have failed this many times, so an item that crashes its worker cannot do it forever (default is
+            None, the attempts are left as they are)
+        :return: The number of released items
+        """
+
+        where, params = 'state = ?', [CLAIMED]
+        if worker is not None:
+            where, params = where + ' AND claimed_by = ?', params + [worker]
+        with self._transaction() as cursor:
+            if max_attempts is None:
+                cursor.execute('UPDATE items SET state = ?, claimed_by = NULL WHERE ' + where, [PENDING] + params)
+            else:
+                cursor.execute('UPDATE items SET attempts = attempts + 1, last_transient = 0, claimed_by = NULL, '
+                               'updated_at = ?, state = CASE WHEN attempts + 1 >= ? THEN ? ELSE ? END WHERE ' + where,
+                               [time.time(), max_attempts, FAILED, PENDING] + params)
+            return cursor.rowcount
+
+    def counts(self):
+        """
+        Count the items in each state
+
+        :return: A dict with the pending, claimed, done and failed counts
+        """
+
+        counts = dict(self.connection.execute('SELECT state, COUNT(*) FROM items GROUP BY state').fetchall())
+        return {
+            'pending': counts.get(PENDING, 0),
+            'claimed': counts.get(CLAIMED, 0),
+            'done': counts.get(DONE, 0),
+            'failed': counts.get(FAILED, 0),
+        }
+
+    def _insert(self, cursor, items):
+        before = self.connection.total_changes
+        cursor.executemany('INSERT OR IGNORE INTO items (kind, item_id, updated_at) VALUES (?, ?, ?)',
+                           [(kind, str(item_id), time.time()) for kind, item_id in items])
+        return self.connection.total_changes - before
+
+    def _transaction(self):
+        return _Transaction(self.connection)
+
+
+class _Transaction:
+    """BEGIN IMMEDIATE takes the write lock up front, so two processes never claim the same item"""
+
+    def __init__(self, connection):
+        self.connection = connection
+        self.cursor = None
+
+    def __enter__(self):
+        self.cursor = self.connection.cursor()
+        self.cursor.execute('BEGIN IMMEDIATE')
+        return self.cursor
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.cursor.execute('COMMIT')
+        else:
+            self.cursor.execute('ROLLBACK')
+        self.cursor.close()
+        return False
+
+
+def _archive_match(faceit_data, archive, match_id, details, details_data):
+    """
+    Fetch the stats of a match and append both to the archive
+
+    :return: None once archived, the failed match_stats Result if the stats should be tried again later
+    """
+
+    # The bodies are archived as received, only the stats columns need the stats decoded
+    stats = faceit_data.fetch('match_stats', match_id, raw=True)
+    if stats.transient:
+        return stats
+    # A match that is not finished yet has no stats, it is archived with its details only
+    archive.add(match_id, details, stats.data if stats.ok else None, details_data)
+    return None
+
+
+def _crawl_worker(api_token, journal_path, rate_limiter, fetchers, handler, batch_size, max_attempts, idle_delay,
+                  archive_path=None, profile_path=None, max_transient_attempts=10, retry_delay=1):
+    """The loop each crawl process runs until the journal has no pending or claimed items left"""
+
+    profiler = None
+    if profile_path is not None:
+        from .profiling import Profiler
+
+        profiler = Profiler()
+    journal = CrawlJournal(journal_path)
+    faceit_data = FaceitData(api_token, rate_limiter=rate_limiter, profiler=profiler)
+    worker = os.getpid()
+    archive = None
+    if archive_path is not None:
+        from .archive import ArchiveWriter
+
+        archive = ArchiveWriter(archive_path)
+    # Transient failures in a row, the worker backs off longer after each so an outage does not burn the queue
+    streak = 0
+
+    def back_off(result):
+        nonlocal streak
+        streak += 1
+        with _span(profiler, 'retry_after'):
+            time.sleep(backoff(result, streak, retry_delay))
+
+    try:
+        while True:
+            items = journal.claim(worker, batch_size)
+            if not items:
+                counts = journal.counts()
+                if counts['pending'] == 0 and counts['claimed'] == 0:
+                    return
+                # Other workers are still busy and may discover more items
+                with _span(profiler, 'idle'):
+                    time.sleep(idle_delay)
+                continue
+
+            for kind, item_id in items:
+                archiving = archive is not None and fetchers[kind] == 'match_details'
+                try:
+                    result = faceit_data.fetch(fetchers[kind], item_id, raw=archiving)
+                    if result.transient:
+                        journal.fail(kind, item_id, max_transient_attempts, transient=True)
+                        back_off(result)
+                        continue
+                    if not result.ok:
+                        journal.fail(kind, item_id, max_attempts, permanent=True)
+                        continue
+
+                    data = result.data
+                    if archiving:
+                        # Decoded once here for the handler and the archive index
+                        with _span(profiler, 'decode'):
+                            data = json.loads(data)
+                        with _span(profiler, 'archive'):
+                            failed = _archive_match(faceit_data, archive, item_id, result.data, data)
+                        if failed is not None:
+                            journal.fail(kind, item_id, max_transient_attempts, transient=True)
+                            back_off(failed)
+                            continue
+                    streak = 0
+
+                    discovered = ()
+                    if handler is not None:
+                        with _span(profiler, 'handler', kind):
+                            discovered = list(handler(faceit_data, kind, item_id, data) or ())
+                except Exception:
+                    logger.exception('Crawling %s %s failed', kind, item_id)
+                    journal.fail(kind, item_id, max_attempts)
+                    continue
+                with _span(profiler, 'journal'):
+                    journal.complete(kind, item_id, discovered)
+    finally:
+        journal.close()
+        if archive is not None:
+            archive.close()
+        if profiler is not None:
+            profiler.write('{}-{}'.format(profile_path, worker))
+
+
+def _span(profiler, name, detail=None):
+    return profiler.span(name, detail) if profiler is not None else nullcontext()
+
+
+class CrawlCoordinator:
+    """Spreads a crawl over a pool of processes that share one work queue and one rate budget"""
+
+    def __init__(self, api_token, journal_path, handler=None, processes=None, rate=10, burst=1, fetchers=None,
+                 batch_size=10, max_attempts=3, idle_delay=0.5, archive_path=None, profile_path=None,
+                 max_restarts=None, max_transient_attempts=10, retry_delay=1):
+        """
+        Constructor Keyword arguments:
+
+        :param api_token: The api token used for the Faceit API
+        :param journal_path: The path of the SQLite journal, reusing it resumes the crawl where it stopped
+        :param handler: A picklable function called as handler(faceit_data, kind, item_id, data) in the worker
+            processes. It can return an iterable of (kind, item_id) tuples to add to the crawl
+        :param processes: The number of worker processes (default is the number of CPUs)
+        :param rate: The number of requests per second allowed across all processes (default 10)
+        :param burst: The number of requests that may be sent back to back (default 1)
+        :param fetchers: A dict of kind to FaceitData method name (default is player, match and championship)
+        :param batch_size: The number of items a worker claims at once (default 10)
+        :param max_attempts: The number of failed requests, or of workers crashed while holding the item, before an
+            item is given up on (default 3). Timeouts, rate limits and server errors are counted apart
+        :param max_transient_attempts: The number of timeouts, rate limits and server errors before an item is given
+            up on, run() queues these items again (default 10)
+        :param retry_delay: The number of seconds a worker waits after a transient failure without a Retry-After,
+            doubled for every one in a row (default 1)
+        :param idle_delay: The number of seconds an idle worker waits before polling the queue again (default 0.5)
+        :param archive_path: A MatchArchive directory the details and stats of every crawled match are appended to
+            (default is None, nothing is archived)
+        :param profile_path: Profile every worker and write its summary, Chrome trace and folded stacks to
+            <profile_path>-<pid>.txt, .trace.json and .folded when it exits (default is None, no profiling)
+        :param max_restarts: The number of crashed workers replaced before the crawl is stopped with a RuntimeError
+            (default is None, 10 per process)
+        """
+
+        self.api_token = api_token
+        self.journal_path = journal_path
+        self.handler = handler
+        self.processes = processes or os.cpu_count() or 1
+        self.rate_limiter = RateLimiter(rate, burst, shared=True)
+        self.fetchers = dict(DEFAULT_FETCHERS if fetchers is None else fetchers)
+        self.batch_size = batch_size
+        self.max_attempts = max_attempts
+        self.idle_delay = idle_delay
+        self.archive_path = archive_path
+        self.profile_path = profile_path
+        self.max_restarts = 10 * self.processes if max_restarts is None else max_restarts
+        self.max_transient_attempts = max_transient_attempts
+        self.retry_delay = retry_delay
+
+        self.journal = CrawlJournal(journal_path)
+
+    def add(self, kind, item_ids):
+        """
+        Queue items of one kind, items already in the journal are skipped
+
+        :param kind: The kind of the items, one of the fetchers keys
+        :param item_ids: An iterable of IDs
+        :return: The number of newly queued items
+        """
+
+        if kind not in self.fetchers:
+            raise ValueError('Unknown kind "{}", expected one of {}'.format(kind, sorted(self.fetchers)))
+        return self.journal.add((kind, item_id) for item_id in item_ids)
+
+    def run(self, requeue_transient=True):
+        """
+        Run the crawl until the queue is empty. Crashed workers have their claims released and are replaced
+
+        :param requeue_transient: Queue the items a previous run gave up on after timeouts, rate limits or server errors
+            again (default True)
+        :return: The item counts of the journal once the crawl is finished
+        :raises: RuntimeError if more than max_restarts workers crashed
+        """
+
+        # Anything still claimed belongs to a previous run that did not finish
+        self.journal.release()
+        if requeue_transient:
+            self.journal.requeue_failed()
+
+        workers = [self._start_worker() for _ in range(self.processes)]
+        restarts = 0
+        try:
+            while workers:
+                time.sleep(self.idle_delay)
+                for process in list(workers):
+                    if process.is_alive():
+                        continue
+                    process.join()
+                    workers.remove(process)
+                    if process.exitcode == 0:
+                        continue
+                    released = self.journal.release(process.pid, self.max_attempts)
+                    logger.warning('Crawl worker %s exited with code %s holding %s items', process.pid,
+                                   process.exitcode, released)
+                    restarts += 1
+                    if restarts > self.max_restarts:
+                        raise RuntimeError('{} crawl workers crashed, giving up'.format(restarts))
+                    workers.append(self._start_worker())
+        finally:
+            for process in workers:
+                process.terminate()
+                process.join()
+
+        return self.journal.counts()
+
+    def _start_worker(self):
+        process = multiprocessing.Process(
+            target=_crawl_worker,
+            args=(self.api_token, self.journal_path, self.rate_limiter, self.fetchers, self.handler, self.batch_size,
+                  self.max_attempts, self.idle_delay, self.archive_path, self.profile_path, self.max_transient_attempts,
+                  self.retry_delay),
+            daemon=True)
+        process.start()
+        return process
@@ -0,0 +1,248 @@
+import json
+import os
+import random
+import threading
+import time
+from array import array
+from contextlib import contextmanager
+
+# The order phases are listed in by the summary, anything else comes after them
+PHASES = ('rate_limit', 'connect', 'tls', 'send', 'wait', 'headers', 'body', 'decode', 'client', 'request')
+
+PHASE_DESCRIPTIONS = {
+    'rate_limit': 'waiting on the rate limiter or scheduler',
+    'connect': 'DNS and TCP connect (http2 transport)',
+    'tls': 'TLS handshake (http2 transport)',
+    'send': 'sending the request (http2 transport)',
+    'wait': 'waiting on the server for the response headers (http2 transport)',
+    'headers': 'connect, TLS, send and waiting on the server (requests transport)',
+    'body': 'receiving the response body',
+    'decode': 'json.loads of the body',
+    'client': 'client bookkeeping not covered by the other phases',
+    'request': 'the whole call, all of the above',
+}
+
+
+class RequestTrace:
+    """The phases of one request, collected from the client and the transport"""
+
+    __slots__ = ('profiler', 'endpoint', 'started', 'thread', 'phases')
+
+    def __init__(self, profiler, endpoint):
+        self.profiler = profiler
+        self.endpoint = endpoint
+        self.started = time.perf_counter()
+        self.thread = threading.get_ident()
+        self.phases = []
+
+    def add(self, phase, started, ended):
+        """
+        Record a phase, also the trace callback handed to the transports
+
+        :param phase: The phase name, see PHASES
+        :param started: The perf_counter time the phase started at
+        :param ended: The perf_counter time the phase ended at
+        """
+
+        self.phases.append((phase, started, ended))
+
+    def finish(self, result):
+        self.profiler.finish_request(self, result)
+
+
+class PhaseStats:
+    """
+    The durations of one phase: the exact count, total and max, and a uniform sample of at most max_samples durations
+    for the percentiles
+    """
+
+    __slots__ = ('count', 'total', 'max', 'samples', 'max_samples', '_random')
+
+    def __init__(self, max_samples, random_state):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.samples = array('d')
+        self.max_samples = max_samples
+        self._random = random_state
+
+    def add(self, duration):
+        self.count += 1
+        self.total += duration
+        if duration > self.max:
+            self.max = duration
+        if len(self.samples) < self.max_samples:
+            self.samples.append(duration)
+        else:
+            # Reservoir sampling, every duration so far is in the sample with the same chance
+            i = self._random.randrange(self.count)
+            if i < self.max_samples:
+                self.samples[i] = duration
+
+
+class Profiler:
+    """
+    Records where the time of a run goes: rate limiter waits, the phases of each request, JSON decoding and any spans
+    of your own processing. write() saves a summary, a Chrome trace (chrome://tracing, Perfetto or speedscope) and
+    folded stacks (flamegraph.pl, speedscope) of the run.
+    """
+
+    def __init__(self, max_events=1000000, max_samples=10000):
+        """
+        Constructor Keyword arguments:
+
+        :param max_events: The number of trace events kept, past that only the summary and folded stacks are updated
+            (default 1000000)
+        :param max_samples: The number of durations kept per phase for the p50 and p95 of the summary, past that they
+            are estimated from a uniform sample. The count, total, mean and max stay exact (default 10000)
+        """
+
+        if max_samples < 1:
+            raise ValueError('max_samples must be at least 1')
+        self.max_events = max_events
+        self.max_samples = max_samples
+        self.started = time.perf_counter()
+        self.events = []
+        self.durations = {}
+        self.folded = {}
+        self.statuses = {}
+        self.dropped_events = 0
+        self._lock = threading.Lock()
+        self._random = random.Random()
+
+    def request(self, endpoint):
+        """
+        :return: A RequestTrace the client fills in, then hands back with finish_request
+        """
+
+        return RequestTrace(self, endpoint)
+
+    def finish_request(self, trace, result):
+        ended = time.perf_counter()
+        covered = 0.0
+        with self._lock:
+            for phase, started, phase_ended in trace.phases:
+                covered += phase_ended - started
+                self._record(phase, started, phase_ended, trace.thread, 'request;' + trace.endpoint, None)
+            # Hedged requests overlap, the client time cannot go below 0
+            client = max(0.0, (ended - trace.started) - covered)
+            self._count('client', client, 'request;{};client'.format(trace.endpoint))
+            self._record('request', trace.started, ended, trace.thread, None,
+                         {'endpoint': trace.endpoint, 'status': result.status, 'cached': result.cached})
+            self.statuses[result.status] = self.statuses.get(result.status, 0) + 1
+
+    @contextmanager
+    def span(self, name, detail=None):
+        """
+        Time a block of your own code, e.g. the processing of a response
+
+        :param name: The name of the span, shown as a phase in the summary
+        :param detail: A second level in the folded stacks, e.g. the kind of item processed (default is None)
+        """
+
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            ended = time.perf_counter()
+            with self._lock:
+                self._record(name, started, ended, threading.get_ident(), None,
+                             None if detail is None else {'detail': detail}, detail)
+
+    def summary(self):
+        """
+        :return: A dict of phase name to a dict of count, total, mean, p50, p95 and max seconds
+        """
+
+        with self._lock:
+            durations = {phase: (stats.count, stats.total, stats.max, sorted(stats.samples))
+                         for phase, stats in self.durations.items()}
+        order = {phase: i for i, phase in enumerate(PHASES)}
+        summary = {}
+        for phase in sorted(durations, key=lambda phase: (order.get(phase, len(order)), phase)):
+            count, total, longest, values = durations[phase]
+            summary[phase] = {
+                'count': count,
+                'total': total,
+                'mean': total / count,
+                'p50': values[len(values) // 2],
+                'p95': values[min(len(values) - 1, int(len(values) * 0.95))],
+                'max': longest,
+            }
+        return summary
+
+    def format_summary(self):
+        elapsed = time.perf_counter() - self.started
+        requests = self.durations.get('request')
+        lines = ['Profile of {:.1f}s, {} requests, statuses {}'.format(
+            elapsed, 0 if requests is None else requests.count, dict(sorted(self.statuses.items(), key=str)))]
+        lines.append('{:<12} {:>8} {:>10} {:>7} {:>9} {:>9} {:>9} {:>9}  {}'.format(
+            'phase', 'count', 'total s', 'wall %', 'mean ms', 'p50 ms', 'p95 ms', 'max ms', ''))
+        for phase, stats in self.summary().items():
+            lines.append('{:<12} {:>8} {:>10.3f} {:>7.1f} {:>9.2f} {:>9.2f} {:>9.2f} {:>9.2f}  {}'.format(
+                phase, stats['count'], stats['total'], 100 * stats['total'] / max(elapsed, 1e-9),
+                stats['mean'] * 1000, stats['p50'] * 1000, stats['p95'] * 1000, stats['max'] * 1000,
+                PHASE_DESCRIPTIONS.get(phase, '')))
+        if self.dropped_events:
+            lines.append('{} trace events were dropped past max_events'.format(self.dropped_events))
+        return '\n'.join(lines)
+
+    def write(self, prefix):
+        """
+        Write the profile of the run
+
+        :param prefix: The path the files are named after, e.g. 'profiles/crawl'
+        :return: The paths of the <prefix>.txt summary, <prefix>.trace.json Chrome trace and <prefix>.folded stacks
+        """
+
+        directory = os.path.dirname(prefix)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        paths = ['{}.txt'.format(prefix), '{}.trace.json'.format(prefix), '{}.folded'.format(prefix)]
+
+        with open(paths[0], 'w', encoding='utf-8') as file:
+            file.write(self.format_summary() + '\n')
+
+        with self._lock:
+            events = list(self.events)
+            folded = dict(self.folded)
+        pid = os.getpid()
+        with open(paths[1], 'w', encoding='utf-8') as file:
+            file.write('{"displayTimeUnit":"ms","traceEvents":[\n')
+            for i, (name, category, started, ended, thread, args) in enumerate(events):
+                event = {'name': name, 'cat': category, 'ph': 'X', 'pid': pid, 'tid': thread,
+                         'ts': round((started - self.started) * 1e6, 3), 'dur': round((ended - started) * 1e6, 3)}
+                if args:
+                    event['args'] = args
+                file.write(('' if i == 0 else ',\n') + json.dumps(event, separators=(',', ':')))
+            file.write('\n]}\n')
+
+        with open(paths[2], 'w', encoding='utf-8') as file:
+            for stack, seconds in sorted(folded.items()):
+                microseconds = int(round(seconds * 1e6))
+                if microseconds:
+                    file.write('{} {}\n'.format(stack, microseconds))
+        return paths
+
+    def _record(self, name, started, ended, thread, parent, args, detail=None):
+        # Callers hold the lock
+        if parent is not None:
+            stack = '{};{}'.format(parent, name)
+        elif name == 'request':
+            stack = None
+        else:
+            stack = name if detail is None else '{};{}'.format(name, detail)
+        self._count(name, ended - started, stack)
+        if len(self.events) < self.max_events:
+            self.events.append((name, 'request' if parent is not None or name == 'request' else 'span', started,
+                                ended, thread, args))
+        else:
+            self.dropped_events += 1
+
+    def _count(self, name, duration, stack):
+        stats = self.durations.get(name)
+        if stats is None:
+            stats = self.durations[name] = PhaseStats(self.max_samples, self._random)
+        stats.add(duration)
+        if stack is not None:
+            self.folded[stack] = self.folded.get(stack, 0.0) + duration
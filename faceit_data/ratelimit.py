@@ -0,0 +1,87 @@
+import multiprocessing
+import threading
+import time
+
+
+class _Value:
+    """A plain stand-in for multiprocessing.Value when the limiter is only used by one process"""
+
+    __slots__ = ('value',)
+
+    def __init__(self, value):
+        self.value = value
+
+
+class RateLimiter:
+    """Spaces requests out so they stay inside an API key's request budget"""
+
+    def __init__(self, rate, burst=1, shared=False):
+        """
+        Constructor Keyword arguments:
+
+        :param rate: The number of requests allowed per second
+        :param burst: The number of requests that may be sent back to back before spacing kicks in (default 1)
+        :param shared: Keep the limiter state in shared memory so one budget covers every process it is passed to
+            (default False)
+        """
+
+        if rate <= 0:
+            raise ValueError('rate must be greater than 0')
+        if burst < 1:
+            raise ValueError('burst must be at least 1')
+
+        self.rate = float(rate)
+        self.burst = int(burst)
+        self.interval = 1.0 / self.rate
+        self.shared = shared
+
+        if shared:
+            self._lock = multiprocessing.Lock()
+            self._tat = multiprocessing.RawValue('d', 0.0)
+        else:
+            self._lock = threading.Lock()
+            self._tat = _Value(0.0)
+
+    def reserve(self):
+        """
+        Reserve a slot for one request without waiting for it
+
+        :return: The number of seconds the caller has to wait before sending the request
+        """
+
+        tolerance = (self.burst - 1) * self.interval
+        with self._lock:
+            # time.monotonic is system wide, so the shared "theoretical arrival time" is comparable across processes
+            now = time.monotonic()
+            tat = max(self._tat.value, now)
+            self._tat.value = tat + self.interval
+        return max(0.0, tat - now - tolerance)
+
+    def try_acquire(self):
+        """
+        Take a slot only if one is free right now
+
+        :return: 0.0 if the slot was taken, otherwise the number of seconds until one frees up (nothing is reserved)
+        """
+
+        tolerance = (self.burst - 1) * self.interval
+        with self._lock:
+            now = time.monotonic()
+            tat = max(self._tat.value, now)
+            wait = tat - now - tolerance
+            if wait > 0:
+                return wait
+            self._tat.value = tat + self.interval
+        return 0.0
+
+    def acquire(self):
+        """
+        Block until a request may be sent
+
+        :return: The number of seconds spent waiting
+        """
+
+        wait = self.reserve()
+        if wait > 0:
+            time.sleep(wait)
+        return wait
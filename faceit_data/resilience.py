@@ -0,0 +1,141 @@
+import threading
+import time
+from collections import deque
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half-open'
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of sending a request while the circuit breaker is open"""
+
+    def __init__(self, retry_in):
+        super().__init__('The Faceit API circuit breaker is open, retry in {:.1f}s'.format(retry_in))
+        self.retry_in = retry_in
+
+
+class CircuitBreaker:
+    """Stops sending requests for a while after the API keeps failing, so callers fail fast instead of piling up"""
+
+    def __init__(self, failure_threshold=5, recovery_timeout=30, half_open_requests=1):
+        """
+        Constructor Keyword arguments:
+
+        :param failure_threshold: The number of consecutive failures (timeouts, connection errors, 5xx) that open
+            the circuit (default 5)
+        :param recovery_timeout: The number of seconds the circuit stays open before trial requests are let through,
+            and the longest a trial request may go without an outcome before its slot is given to another (default 30)
+        :param half_open_requests: The number of trial requests allowed at once while half open (default 1)
+        """
+
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.half_open_requests = half_open_requests
+
+        self.state = CLOSED
+        self.failures = 0
+        self._opened_at = 0.0
+        self._trials = 0
+        self._trial_started = 0.0
+        self._lock = threading.Lock()
+
+    def before_request(self):
+        """
+        Check whether a request may be sent
+
+        :return: True if the request is a half open trial, its outcome has to be recorded or the slot released
+        :raises CircuitOpenError: If the circuit is open, or half open with all trial slots taken
+        """
+
+        with self._lock:
+            if self.state == CLOSED:
+                return False
+
+            now = time.monotonic()
+            retry_in = self._opened_at + self.recovery_timeout - now
+            if self.state == OPEN:
+                if retry_in > 0:
+                    raise CircuitOpenError(retry_in)
+                self.state = HALF_OPEN
+                self._trials = 0
+
+            if self._trials >= self.half_open_requests:
+                # Trials that never reported back are given up on after recovery_timeout
+                expires_in = self._trial_started + self.recovery_timeout - now
+                if expires_in > 0:
+                    raise CircuitOpenError(expires_in)
+                self._trials = 0
+            self._trials += 1
+            self._trial_started = now
+            return True
+
+    def release(self):
+        """Give back the slot of a half open trial that ended without an outcome, e.g. it raised or was cancelled"""
+
+        with self._lock:
+            if self.state == HALF_OPEN and self._trials > 0:
+                self._trials -= 1
+
+    def record_success(self):
+        with self._lock:
+            self.state = CLOSED
+            self.failures = 0
+            self._trials = 0
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+                self.state = OPEN
+                self._opened_at = time.monotonic()
+                self._trials = 0
+
+
+class LatencyTracker:
+    """Keeps a sliding window of response times per endpoint to know when a request is running late"""
+
+    def __init__(self, window=200, min_samples=20):
+        """
+        Constructor Keyword arguments:
+
+        :param window: The number of recent response times kept per endpoint (default 200)
+        :param min_samples: The number of samples needed before percentiles are reported (default 20)
+        """
+
+        self.window = window
+        self.min_samples = min_samples
+        self._samples = {}
+        self._cache = {}
+        self._lock = threading.Lock()
+
+    def record(self, endpoint, seconds):
+        with self._lock:
+            samples = self._samples.get(endpoint)
+            if samples is None:
+                samples = self._samples[endpoint] = deque(maxlen=self.window)
+            samples.append(seconds)
+            self._cache.pop(endpoint, None)
+
+    def percentile(self, endpoint, q=95):
+        """
+        Get a percentile of the recent response times of an endpoint
+
+        :param endpoint: The endpoint name
+        :param q: The percentile between 0 and 100 (default 95)
+        :return: The response time in seconds, or None if there are not enough samples yet
+        """
+
+        with self._lock:
+            key = (endpoint, q)
+            cached = self._cache.get(endpoint)
+            if cached is not None and cached[0] == key:
+                return cached[1]
+
+            samples = self._samples.get(endpoint)
+            if samples is None or len(samples) < self.min_samples:
+                return None
+            ordered = sorted(samples)
+            value = ordered[min(len(ordered) - 1, int(len(ordered) * q / 100.0))]
+            self._cache[endpoint] = (key, value)
+            return value
@@ -0,0 +1,175 @@
+import threading
+import time
+from collections import OrderedDict
+
+# Statuses worth retrying later, everything else in the 4xx range will fail the same way again
+TRANSIENT_STATUSES = frozenset([408, 425, 429, 500, 502, 503, 504])
+
+# Longest a retry waits on a Retry-After for, in seconds
+MAX_RETRY_AFTER = 60
+
+
+class Result:
+    """The outcome of one request, with enough detail to decide whether to retry it"""
+
+    __slots__ = ('status', 'data', 'retry_after', 'elapsed', 'error', 'cached')
+
+    def __init__(self, status, data=None, retry_after=None, elapsed=0.0, error=None, cached=False):
+        """
+        Constructor Keyword arguments:
+
+        :param status: The HTTP status code, None if no response was received
+        :param data: The decoded JSON (or body bytes in raw mode) of a successful request
+        :param retry_after: The number of seconds the API asked us to wait before retrying, if any
+        :param elapsed: The number of seconds the request took
+        :param error: The exception that stopped the request (timeout, connection error, open circuit), if any
+        :param cached: True if the result came from the negative cache without a request
+        """
+
+        self.status = status
+        self.data = data
+        self.retry_after = retry_after
+        self.elapsed = elapsed
+        self.error = error
+        self.cached = cached
+
+    @property
+    def ok(self):
+        return self.status == 200
+
+    @property
+    def transient(self):
+        """True if the same request may succeed later (timeouts, rate limits, server errors)"""
+
+        return self.status is None or self.status in TRANSIENT_STATUSES
+
+    @property
+    def permanent(self):
+        """True if the same request will keep failing (missing entity, bad parameters, bad token)"""
+
+        return self.status is not None and self.status != 200 and self.status not in TRANSIENT_STATUSES
+
+    def __bool__(self):
+        return self.status == 200
+
+    def __repr__(self):
+        return 'Result(status={!r}, elapsed={:.3f}, retry_after={!r}, error={!r}, cached={!r})'.format(
+            self.status, self.elapsed, self.retry_after, self.error, self.cached)
+
+
+def parse_retry_after(value):
+    """
+    Parse a Retry-After header
+
+    :param value: The header value, either a number of seconds or an HTTP date
+    :return: The number of seconds to wait, or None if the header is missing or malformed
+    """
+
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+
+    from email.utils import parsedate_to_datetime
+
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def backoff(result, attempt, base=2):
+    """
+    How long to wait before trying a failed request again
+
+    :param result: The Result of the failed request
+    :param attempt: The number of failures in a row so far, starting at 1
+    :param base: The wait after the first failure when the API did not send a Retry-After, doubled for every failure
+        after it (default 2)
+    :return: The number of seconds to wait, the Retry-After if there is one, at most MAX_RETRY_AFTER
+    """
+
+    wait = base * 2 ** (attempt - 1) if result.retry_after is None else result.retry_after
+    return min(wait, MAX_RETRY_AFTER)
+
+
+def retry(fetch, max_attempts, on_retry=None):
+    """
+    Call fetch until it succeeds, fails for good or max_attempts are used up, waiting with backoff in between
+
+    :param fetch: A callable returning a Result
+    :param max_attempts: The number of calls at most
+    :param on_retry: A callable called as on_retry(result, attempt) before each wait (default is None)
+    :return: The Result of the last call
+    """
+
+    for attempt in range(1, max_attempts + 1):
+        result = fetch()
+        if not result.transient or attempt == max_attempts:
+            return result
+        if on_retry is not None:
+            on_retry(result, attempt)
+        time.sleep(backoff(result, attempt))
+
+
+async def async_retry(fetch, max_attempts, on_retry=None):
+    """
+    retry for coroutines, fetch is a callable returning an awaitable of a Result
+    """
+
+    import asyncio
+
+    for attempt in range(1, max_attempts + 1):
+        result = await fetch()
+        if not result.transient or attempt == max_attempts:
+            return result
+        if on_retry is not None:
+            on_retry(result, attempt)
+        await asyncio.sleep(backoff(result, attempt))
+
+
+class NegativeCache:
+    """Remembers URLs that returned 404 so missing entities are not requested over and over"""
+
+    def __init__(self, ttl=300, maxsize=10000):
+        """
+        Constructor Keyword arguments:
+
+        :param ttl: The number of seconds a 404 is remembered (default 300)
+        :param maxsize: The maximum number of URLs remembered, the oldest are dropped first (default 10000)
+        """
+
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __contains__(self, api_url):
+        with self._lock:
+            expires = self._entries.get(api_url)
+            if expires is None:
+                return False
+            if expires < time.monotonic():
+                del self._entries[api_url]
+                return False
+            return True
+
+    def __len__(self):
+        return len(self._entries)
+
+    def add(self, api_url):
+        with self._lock:
+            self._entries[api_url] = time.monotonic() + self.ttl
+            self._entries.move_to_end(api_url)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def discard(self, api_url):
+        with self._lock:
+            self._entries.pop(api_url, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
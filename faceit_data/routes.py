@@ -0,0 +1,510 @@
+from urllib.parse import quote, quote_plus
+
+REQUIRED = object()
+
+RAW_DOC = ("Return the undecoded body bytes instead of JSON, or 'compressed' for the\n"
+           "    bytes exactly as transferred")
+
+
+# Characters quote() never escapes, values made only of these (most IDs) skip quoting altogether
+UNRESERVED = frozenset('ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789_.-~')
+
+
+def encode_query(value):
+    value = str(value)
+    if UNRESERVED.issuperset(value):
+        return value
+    return quote_plus(value)
+
+
+def encode_path(value):
+    value = str(value)
+    if UNRESERVED.issuperset(value):
+        return value
+    return quote(value, safe='')
+
+
+def encode_int(value):
+    return str(int(value))
+
+
+def encode_expanded(value):
+    value = value.lower()
+    if value in ('game', 'organizer'):
+        return value
+    return None
+
+
+def expand_flag(entity):
+    """Encoder for boolean parameters that expand an entity when set"""
+
+    def encode(value):
+        return entity if value else None
+    return encode
+
+
+class Param:
+    """A parameter of an endpoint, either a path segment or a query string argument"""
+
+    __slots__ = ('name', 'doc', 'key', 'default', 'encode')
+
+    def __init__(self, name, doc, key=None, default=None, encode=None):
+        """
+        Constructor Keyword arguments:
+
+        :param name: The name of the method argument
+        :param doc: The description used in the generated docstring
+        :param key: The query string key, None for a path parameter
+        :param default: The default value of the argument, REQUIRED if it has none (default is REQUIRED for path
+            parameters and None, left out of the query string, for query parameters)
+        :param encode: A function turning the value into its URL form, returning None leaves the argument out
+            (default quotes the value)
+        """
+
+        self.name = name
+        self.doc = doc
+        self.key = key
+        self.default = REQUIRED if key is None and default is None else default
+        if encode is None:
+            encode = encode_path if key is None else encode_query
+        self.encode = encode
+
+    @property
+    def in_path(self):
+        return self.key is None
+
+    @property
+    def optional(self):
+        """Optional query arguments are only sent when they are not None"""
+
+        return self.key is not None and self.default is None
+
+
+def offset(default=0):
+    return Param('starting_item_position', 'The starting item position (default {})'.format(default), 'offset',
+                 default, encode_int)
+
+
+def limit(default=20):
+    return Param('return_items', 'The number of items to return (default {})'.format(default), 'limit', default,
+                 encode_int)
+
+
+class Route:
+    """An endpoint of the Data API, the methods, URL builder and docstring of an endpoint are generated from it"""
+
+    __slots__ = ('name', 'path', 'doc', 'params', 'items_key', '_url')
+
+    def __init__(self, name, path, doc, params=(), items_key='items'):
+        """
+        Constructor Keyword arguments:
+
+        :param name: The name of the generated method
+        :param path: The path under the base URL, with {name} placeholders for the path parameters
+        :param doc: The first line of the generated docstring
+        :param params: The parameters in the order of the method arguments
+        :param items_key: The key of the list in paginated responses (default is items)
+        """
+
+        self.name = name
+        self.path = path
+        self.doc = doc
+        self.params = tuple(params)
+        self.items_key = items_key
+        self._url = None
+
+        for param in self.params:
+            if param.in_path and '{' + param.name + '}' not in path:
+                raise ValueError('Path parameter {} is missing from {}'.format(param.name, path))
+
+    @property
+    def url(self):
+        """The URL builder, a function taking the base URL and the arguments of the endpoint method"""
+
+        if self._url is None:
+            self._url = self.compile('')['_url']
+        return self._url
+
+    def compile(self, template, **fields):
+        """
+        Compile generated source next to the route's URL builder
+
+        :param template: The source, formatted with name, signature (ending with the given extra argument) and args
+            (the arguments of the URL builder, which the source can call as _url)
+        :param fields: extra (an argument appended to the signature) and paged (replace starting_item_position and
+            return_items by offset and limit in args)
+        :return: The namespace the source was executed in
+        """
+
+        namespace = {}
+        for position, param in enumerate(self.params):
+            namespace['_e_' + param.name] = param.encode
+            if param.default is not REQUIRED:
+                namespace['_d{}'.format(position)] = param.default
+
+        names = [param.name for param in self.params]
+        if fields.get('paged'):
+            names = [PAGED_ARGS.get(name, name) for name in names]
+        source = _url_source(self) + [template.format(
+            name=self.name, signature=_signature(self, fields.get('extra')), args=', '.join(names))]
+        exec(compile('\n'.join(source), '<faceit_data route {}>'.format(self.name), 'exec'), namespace)
+        return namespace
+
+    @property
+    def paginated(self):
+        names = [param.name for param in self.params]
+        return 'starting_item_position' in names and 'return_items' in names
+
+    def docstring(self, extra=()):
+        lines = [self.doc, '']
+        for param in self.params:
+            lines.append(':param {}: {}'.format(param.name, param.doc))
+        for name, doc in extra:
+            lines.append(':param {}: {}'.format(name, doc))
+        lines.append(':return:')
+        return '\n'.join(lines)
+
+
+ROUTES = [
+    # Championships
+    Route('championship_details', '/championships/{championship_id}', 'Retrieve championship details', [
+        Param('championship_id', 'The ID of the championship'),
+        Param('expanded', 'List of entity names to expand in request, either "organizer" or "game"', 'expanded',
+              None, encode_expanded),
+    ]),
+    Route('championship_matches', '/championships/{championship_id}/matches', 'Championship match details', [
+        Param('championship_id', 'The championship ID'),
+        Param('type_of_match', 'Kind of matches to return. Can be all(default), upcoming, ongoing or past', 'type',
+              'all'),
+        offset(), limit(),
+    ]),
+    Route('championship_subscriptions', '/championships/{championship_id}/subscriptions',
+          'Retrieve all subscriptions of a championship', [
+              Param('championship_id', 'The championship ID'),
+              offset(), limit(10),
+          ]),
+
+    # Games
+    Route('all_faceit_games', '/games', 'Retrieve details of all games on FACEIT', [offset(), limit()]),
+    Route('game_details', '/games/{game_id}', 'Retrieve game details', [
+        Param('game_id', 'The ID of the game'),
+    ]),
+    Route('game_details_parent', '/games/{game_id}/parent',
+          'Retrieve the details of the parent game, if the game is region-specific.', [
+              Param('game_id', 'The ID of the game'),
+          ]),
+
+    # Hubs
+    Route('hub_details', '/hubs/{hub_id}', 'Retrieve hub details', [
+        Param('hub_id', 'The ID of the hub'),
+        Param('game', 'Expand the game in the response (default is None, but can be True)', 'expanded', None,
+              expand_flag('game')),
+        Param('organizer', 'Expand the organizer in the response (default is None, but can be True)', 'expanded',
+              None, expand_flag('organizer')),
+    ]),
+    Route('hub_matches', '/hubs/{hub_id}/matches', 'Retrieve all matches of a hub', [
+        Param('hub_id', 'The ID of the hub (required)'),
+        Param('type_of_match', 'Kind of matches to return. Default is all, can be upcoming, ongoing, or past', 'type',
+              'all'),
+        offset(), limit(),
+    ]),
+    Route('hub_members', '/hubs/{hub_id}/members', 'Retrieve all members of a hub', [
+        Param('hub_id', 'The ID of the hub (required)'),
+        offset(), limit(),
+    ]),
+    Route('hub_roles', '/hubs/{hub_id}/roles', 'Retrieve all roles members can have in a hub', [
+        Param('hub_id', 'The ID of the hub'),
+        offset(), limit(),
+    ]),
+    Route('hub_statistics', '/hubs/{hub_id}/stats', 'Retrieves statistics of a hub', [
+        Param('hub_id', 'The ID of the hub'),
+        offset(), limit(),
+    ], items_key='players'),
+
+    # Leaderboards
+    Route('championship_leaderboards', '/leaderboards/championships/{championship_id}',
+          'Retrieves all leaderboards of a championship', [
+              Param('championship_id', 'The ID of a championship'),
+              offset(), limit(),
+          ]),
+    Route('championship_group_ranking', '/leaderboards/championships/{championship_id}/groups/{group}',
+          'Retrieve group ranking of a championship', [
+              Param('championship_id', 'The ID of a championship'),
+              Param('group', 'A group of the championship'),
+              offset(), limit(),
+          ]),
+    Route('hub_leaderboards', '/leaderboards/hubs/{hub_id}', 'Retrieve all leaderboards of a hub', [
+        Param('hub_id', 'The ID of the hub'),
+        offset(), limit(),
+    ]),
+    Route('hub_ranking', '/leaderboards/hubs/{hub_id}/general', 'Retrieve all time ranking of a hub', [
+        Param('hub_id', 'The ID of the hub'),
+        offset(), limit(),
+    ]),
+    Route('hub_season_ranking', '/leaderboards/hubs/{hub_id}/seasons/{season}', 'Retrieve seasonal ranking of a hub', [
+        Param('hub_id', 'The ID of the hub'),
+        Param('season', 'A season of the hub'),
+        offset(), limit(),
+    ]),
+    Route('leaderboard_ranking', '/leaderboards/{leaderboard_id}', 'Retrieve ranking from a leaderboard ID', [
+        Param('leaderboard_id', 'The ID of the leaderboard'),
+        offset(), limit(),
+    ]),
+
+    # Matches
+    Route('match_details', '/matches/{match_id}', 'Retrieve match details', [
+        Param('match_id', 'The ID of the match'),
+    ]),
+    Route('match_stats', '/matches/{match_id}/stats', 'Retrieve statistics of a match', [
+        Param('match_id', 'The ID of the match'),
+    ]),
+
+    # Organizers
+    Route('organizer_details_by_name', '/organizers', 'Retrieve organizer details from its name', [
+        Param('name_of_organizer', 'The name of the organizer', 'name', REQUIRED),
+    ]),
+    Route('organizer_id_details', '/organizers/{organizer_id}', 'Retrieve organizer details', [
+        Param('organizer_id', 'The ID of the organizer'),
+    ]),
+    Route('organizer_championships', '/organizers/{organizer_id}/championships',
+          'Retrieve all championships of an organizer', [
+              Param('organizer_id', 'The ID of the organizer'),
+              offset(), limit(),
+          ]),
+    Route('organizer_games', '/organizers/{organizer_id}/games', 'Retrieve all games an organizer is involved with.', [
+        Param('organizer_id', 'The ID of the organizer'),
+    ]),
+    Route('organizer_hubs', '/organizers/{organizer_id}/hubs', 'Retrieve all hubs of an organizer', [
+        Param('organizer_id', 'The ID of the organizer'),
+        offset(), limit(),
+    ]),
+    Route('organizer_tournaments', '/organizers/{organizer_id}/tournaments',
+          'Retrieve all tournaments of an organizer', [
+              Param('organizer_id', 'The ID of the organizer'),
+              Param('type_of_tournament', 'Kind of tournament. Can be upcoming(default) or past', 'type', 'upcoming'),
+              offset(), limit(),
+          ]),
+
+    # Players
+    Route('player_details', '/players', 'Retrieve player details', [
+        Param('nickname', 'The nickname of the player of Faceit', 'nickname', REQUIRED),
+    ]),
+    Route('player_id_details', '/players/{player_id}', 'Retrieve player details', [
+        Param('player_id', 'The ID of the player'),
+    ]),
+    Route('player_matches', '/players/{player_id}/history', 'Retrieve all matches of a player', [
+        Param('player_id', 'The ID of a player'),
+        Param('game', 'A game on Faceit', 'game', REQUIRED),
+        Param('from_timestamp', 'The timestamp (UNIX time) as a lower bound of the query. 1 month ago if not specified',
+              'from', None, encode_int),
+        Param('to_timestamp', 'The timestamp (UNIX time) as a higher bound of the query. Current timestamp if not '
+              'specified', 'to', None, encode_int),
+        offset(), limit(),
+    ]),
+    Route('player_hubs', '/players/{player_id}/hubs', 'Retrieve all hubs of a player', [
+        Param('player_id', 'The ID of a player'),
+        offset(), limit(),
+    ]),
+    Route('player_stats', '/players/{player_id}/stats/{game_id}', 'Retrieve the statistics of a player', [
+        Param('player_id', 'The ID of a player'),
+        Param('game_id', 'A game on Faceit'),
+    ]),
+    Route('player_tournaments', '/players/{player_id}/tournaments', 'Retrieve all tournaments of a player', [
+        Param('player_id', 'The ID of a player'),
+        offset(), limit(),
+    ]),
+
+    # Rankings
+    Route('game_global_ranking', '/rankings/games/{game_id}/regions/{region}', 'Retrieve global ranking of a game', [
+        Param('game_id', 'The ID of a game (Required)'),
+        Param('region', 'A region of a game (Required)'),
+        Param('country', 'A country code (ISO 3166-1)', 'country'),
+        offset(), limit(),
+    ]),
+    Route('player_ranking_of_game', '/rankings/games/{game_id}/regions/{region}/players/{player_id}',
+          'Retrieve user position in the global ranking of a game', [
+              Param('game_id', 'The ID of a game (required)'),
+              Param('region', 'A region of a game (required)'),
+              Param('player_id', 'The ID of a player (required)'),
+              Param('country', 'A country code (ISO 3166-1)', 'country'),
+              limit(),
+          ]),
+
+    # Search
+    Route('search_championships', '/search/championships', 'Search for championships', [
+        Param('name_of_championship', 'The name of a championship on Faceit (required)', 'name', REQUIRED),
+        Param('game', 'A game on Faceit', 'game'),
+        Param('region', 'A region of the game', 'region'),
+        Param('type_of_competition', 'Kind of competitions to return (default is all, can be upcoming, ongoing, or '
+              'past)', 'type', 'all'),
+        offset(), limit(),
+    ]),
+    Route('search_hubs', '/search/hubs', 'Search for hubs', [
+        Param('name_of_hub', 'The name of a hub on Faceit (required)', 'name', REQUIRED),
+        Param('game', 'A game on Faceit', 'game'),
+        Param('region', 'A region of the game', 'region'),
+        offset(), limit(),
+    ]),
+    Route('search_organizers', '/search/organizers', 'Search for organizers', [
+        Param('name_of_organizer', 'The name of an organizer on Faceit', 'name', REQUIRED),
+        offset(), limit(),
+    ]),
+    Route('search_players', '/search/players', 'Search for players', [
+        Param('nickname', 'The nickname of a player on Faceit (required)', 'nickname', REQUIRED),
+        Param('game', 'A game on Faceit', 'game'),
+        Param('country_code', 'A country code (ISO 3166-1)', 'country'),
+        offset(), limit(),
+    ]),
+    Route('search_teams', '/search/teams', 'Search for teams', [
+        Param('nickname', 'The nickname of a team on Faceit (required)', 'nickname', REQUIRED),
+        Param('game', 'A game on Faceit', 'game'),
+        offset(), limit(),
+    ]),
+    Route('search_tournaments', '/search/tournaments', 'Search for tournaments', [
+        Param('name_of_tournament', 'The name of a tournament on Faceit (required)', 'name', REQUIRED),
+        Param('game', 'A game on Faceit', 'game'),
+        Param('region', 'A region of the game', 'region'),
+        Param('type_of_competition', 'Kind of competitions to return (default is all, can be upcoming, ongoing, or '
+              'past)', 'type', 'all'),
+        offset(), limit(),
+    ]),
+
+    # Teams
+    Route('team_details', '/teams/{team_id}', 'Retrieve team details', [
+        Param('team_id', 'The ID of the team (required)'),
+    ]),
+    Route('team_stats', '/teams/{team_id}/stats/{game_id}', 'Retrieve statistics of a team', [
+        Param('team_id', 'The ID of a team (required)'),
+        Param('game_id', 'A game on Faceit (required)'),
+    ]),
+    Route('team_tournaments', '/teams/{team_id}/tournaments', 'Retrieve tournaments of a team', [
+        Param('team_id', 'The ID of a team (required)'),
+        offset(), limit(),
+    ]),
+
+    # Tournaments (no longer used)
+    Route('all_tournaments', '/tournaments', 'Retrieve all tournaments', [
+        Param('game', 'A game on Faceit', 'game'),
+        Param('region', 'A region of the game', 'region'),
+        Param('type_of_tournament', 'Kind of tournament. Can be upcoming(default) or past', 'type', 'upcoming'),
+    ]),
+    Route('tournament_details', '/tournaments/{tournament_id}', 'Retrieve tournament details', [
+        Param('tournament_id', 'The ID of the tournament (required)'),
+        Param('expanded', 'List of entity names to expand in request, either "organizer" or "game"', 'expanded',
+              None, encode_expanded),
+    ]),
+    Route('tournament_brackets', '/tournaments/{tournament_id}/brackets', 'Retrieve brackets of a tournament', [
+        Param('tournament_id', 'The ID of the tournament (required)'),
+    ]),
+    Route('tournament_matches', '/tournaments/{tournament_id}/matches', 'Retrieve all matches of a tournament', [
+        Param('tournament_id', 'The ID of a tournament (required)'),
+        offset(), limit(),
+    ]),
+    Route('tournament_teams', '/tournaments/{tournament_id}/teams', 'Retrieve all teams of a tournament', [
+        Param('tournament_id', 'The ID of a tournament (required)'),
+        offset(), limit(),
+    ]),
+]
+
+ROUTES_BY_NAME = dict((route.name, route) for route in ROUTES)
+
+PAGED_ARGS = {'starting_item_position': 'offset', 'return_items': 'limit'}
+
+
+def _signature(route, extra=None):
+    args = []
+    for position, param in enumerate(route.params):
+        if param.default is REQUIRED:
+            args.append(param.name)
+        else:
+            args.append('{}=_d{}'.format(param.name, position))
+    if extra:
+        args.append(extra)
+    return ', '.join(args)
+
+
+def _url_source(route):
+    """Source of a URL builder: the path and the query arguments that are always sent become one concatenation"""
+
+    parts = ['base_url']
+    literal = ''
+    path = route.path
+    while '{' in path:
+        start = path.index('{')
+        end = path.index('}', start)
+        parts.append(repr(literal + path[:start]))
+        parts.append('_e_{0}({0})'.format(path[start + 1:end]))
+        literal = ''
+        path = path[end + 1:]
+    literal += path
+
+    separator = '?'
+    for param in route.params:
+        if param.in_path or param.optional:
+            continue
+        parts.append(repr('{}{}{}='.format(literal, separator, param.key)))
+        parts.append('_e_{0}({0})'.format(param.name))
+        literal = ''
+        separator = '&'
+    if literal:
+        parts.append(repr(literal))
+
+    lines = [
+        'def _url(base_url, {}):'.format(_signature(route)),
+        '    url = ' + ' + '.join(parts),
+    ]
+    optional = [param for param in route.params if param.optional]
+    if optional:
+        lines.append('    separator = {!r}'.format(separator))
+    for param in optional:
+        lines.append('    if {} is not None:'.format(param.name))
+        lines.append('        value = _e_{0}({0})'.format(param.name))
+        lines.append('        if value is not None:')
+        lines.append("            url += separator + '{}=' + value".format(param.key))
+        lines.append("            separator = '&'")
+    lines.append('    return url')
+    return lines
+
+
+class _GeneratedMethod:
+    """Placeholder for a generated method, compiled and put on the class the first time it is looked up"""
+
+    def __init__(self, route, name, template, doc, extra, paged=False):
+        self.route = route
+        self.name = name
+        self.template = template
+        self.extra = extra
+        self.paged = paged
+        self.__doc__ = doc
+
+    def __get__(self, instance, owner):
+        function = self.route.compile(self.template, extra=self.extra, paged=self.paged)[self.name]
+        function.__doc__ = self.__doc__
+        function.__qualname__ = '{}.{}'.format(owner.__name__, self.name)
+        function.__module__ = owner.__module__
+        setattr(owner, self.name, function)
+        return function.__get__(instance, owner)
+
+
+def install(cls, method_template, paginate_template=None, raw_doc=RAW_DOC):
+    """
+    Add a generated method for every route to a client class. Methods are compiled on first use, which keeps
+    importing the client cheap
+
+    :param cls: The client class
+    :param method_template: The source of a method, formatted with name, signature and args (the arguments of the
+        route's URL builder, which the source can call as _url)
+    :param paginate_template: The source of the iter_ variant of paginated routes, formatted like method_template
+        but with starting_item_position and return_items replaced by offset and limit in args (default is None, no
+        variant)
+    :param raw_doc: The docstring of the raw argument (default is RAW_DOC)
+    """
+
+    for route in ROUTES:
+        setattr(cls, route.name, _GeneratedMethod(
+            route, route.name, method_template, route.docstring([('raw', raw_doc)]), 'raw=False'))
+        if paginate_template is not None and route.paginated:
+            name = 'iter_' + route.name
+            doc = 'Iterate over the items of every page of {}\n\n{}'.format(
+                route.name, route.docstring([('max_items', 'Stop after this many items (default is None, all)')]))
+            setattr(cls, name, _GeneratedMethod(route, name, paginate_template, doc, 'max_items=None', paged=True))
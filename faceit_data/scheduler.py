@@ -0,0 +1,194 @@
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+from .ratelimit import RateLimiter
+
+INTERACTIVE = 'interactive'
+BATCH = 'batch'
+
+# Paginated listings and per-match payloads are what backfills and crawls hammer
+BATCH_ENDPOINTS = frozenset([
+    'championship_matches', 'championship_subscriptions', 'championship_leaderboards', 'championship_group_ranking',
+    'hub_matches', 'hub_members', 'hub_statistics', 'hub_ranking', 'hub_season_ranking', 'leaderboard_ranking',
+    'match_details', 'match_stats', 'organizer_championships', 'organizer_hubs', 'organizer_tournaments',
+    'player_matches', 'game_global_ranking', 'tournament_matches', 'tournament_teams',
+])
+
+
+class PriorityClass:
+    """A class of traffic with its share of the rate budget and its own concurrency cap"""
+
+    def __init__(self, name, share, concurrency):
+        """
+        Constructor Keyword arguments:
+
+        :param name: The name of the class
+        :param share: The relative share of the request rate the class gets while other classes are waiting too
+        :param concurrency: The maximum number of requests of this class in flight at once
+        """
+
+        if share <= 0:
+            raise ValueError('share must be greater than 0')
+        if concurrency < 1:
+            raise ValueError('concurrency must be at least 1')
+
+        self.name = name
+        self.share = float(share)
+        self.concurrency = int(concurrency)
+
+        # Stride scheduling state, guarded by the scheduler's condition
+        self.stride = 1.0 / self.share
+        self.pass_value = 0.0
+        self.in_flight = 0
+        self.waiting = deque()
+
+
+class Scheduler:
+    """Queues requests by priority class so interactive lookups are not starved by bulk traffic on the same key"""
+
+    def __init__(self, rate=10, burst=1, classes=None, endpoint_classes=None, default_class=INTERACTIVE,
+                 rate_limiter=None):
+        """
+        Constructor Keyword arguments:
+
+        :param rate: The number of requests per second allowed for all classes together (default 10)
+        :param burst: The number of requests that may be sent back to back (default 1)
+        :param classes: A list of PriorityClass (default is interactive with 80% and batch with 20% of the rate)
+        :param endpoint_classes: A dict of endpoint name to class name (default sends BATCH_ENDPOINTS to batch)
+        :param default_class: The class of endpoints not in endpoint_classes (default is interactive)
+        :param rate_limiter: A RateLimiter to draw the budget from instead of rate and burst, e.g. a shared one
+        """
+
+        if classes is None:
+            classes = [PriorityClass(INTERACTIVE, 0.8, 8), PriorityClass(BATCH, 0.2, 4)]
+        if endpoint_classes is None:
+            endpoint_classes = dict.fromkeys(BATCH_ENDPOINTS, BATCH)
+
+        self.classes = dict((priority_class.name, priority_class) for priority_class in classes)
+        self.order = [priority_class.name for priority_class in classes]
+        self.endpoint_classes = endpoint_classes
+        self.default_class = default_class
+        self.rate_limiter = rate_limiter if rate_limiter is not None else RateLimiter(rate, burst)
+
+        if default_class not in self.classes:
+            raise ValueError('Unknown default class "{}"'.format(default_class))
+
+        self._condition = threading.Condition()
+        self._virtual_time = 0.0
+        self._local = threading.local()
+
+    def classify(self, endpoint):
+        """
+        Pick the class of a request
+
+        :param endpoint: The name of the FaceitData method making the request
+        :return: The class name, the priority() override of the current thread wins over the endpoint mapping
+        """
+
+        override = getattr(self._local, 'priority', None)
+        if override is not None:
+            return override
+        return self.endpoint_classes.get(endpoint, self.default_class)
+
+    @contextmanager
+    def priority(self, name):
+        """
+        Send every request made by the current thread inside the block with the given class
+
+        :param name: The class name
+        """
+
+        if name not in self.classes:
+            raise ValueError('Unknown priority class "{}"'.format(name))
+
+        previous = getattr(self._local, 'priority', None)
+        self._local.priority = name
+        try:
+            yield
+        finally:
+            self._local.priority = previous
+
+    @contextmanager
+    def slot(self, name):
+        """
+        Hold a request slot of the given class for the duration of the block
+
+        :param name: The class name
+        """
+
+        waited = self.acquire(name)
+        try:
+            yield waited
+        finally:
+            self.release(name)
+
+    def acquire(self, name):
+        """
+        Block until a request of the given class may be sent
+
+        :param name: The class name
+        :return: The number of seconds spent waiting
+        """
+
+        priority_class = self.classes[name]
+        ticket = object()
+        started = time.monotonic()
+
+        with self._condition:
+            if not priority_class.waiting and not priority_class.in_flight:
+                # An idle class must not bank credit and then monopolise the budget when it wakes up
+                priority_class.pass_value = max(priority_class.pass_value, self._virtual_time)
+            priority_class.waiting.append(ticket)
+            self._condition.notify_all()
+
+            while True:
+                head = self._head()
+                if head is priority_class and priority_class.waiting[0] is ticket:
+                    wait = self.rate_limiter.try_acquire()
+                    if wait == 0.0:
+                        priority_class.waiting.popleft()
+                        priority_class.in_flight += 1
+                        self._virtual_time = priority_class.pass_value
+                        priority_class.pass_value += priority_class.stride
+                        self._condition.notify_all()
+                        return time.monotonic() - started
+                    # Wake up early if a more urgent request arrives in the meantime
+                    self._condition.wait(wait)
+                else:
+                    self._condition.wait()
+
+    def release(self, name):
+        """
+        Free a request slot of the given class
+
+        :param name: The class name
+        """
+
+        with self._condition:
+            self.classes[name].in_flight -= 1
+            self._condition.notify_all()
+
+    def stats(self):
+        """
+        Snapshot of the scheduler queues
+
+        :return: A dict of class name to its waiting and in flight counts
+        """
+
+        with self._condition:
+            return dict((name, {'waiting': len(priority_class.waiting), 'in_flight': priority_class.in_flight})
+                        for name, priority_class in self.classes.items())
+
+    def _head(self):
+        """The class allowed to send next: lowest pass among classes that are waiting and under their cap"""
+
+        head = None
+        for name in self.order:
+            priority_class = self.classes[name]
+            if not priority_class.waiting or priority_class.in_flight >= priority_class.concurrency:
+                continue
+            if head is None or priority_class.pass_value < head.pass_value:
+                head = priority_class
+        return head
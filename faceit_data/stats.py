@@ -0,0 +1,285 @@
+import warnings
+from array import array
+from collections import Counter
+
+import numpy as np
+
+# The map key of the lifetime stats, next to the map names of the segments
+LIFETIME = 'lifetime'
+
+AGGREGATES = {
+    'mean': np.nanmean,
+    'median': np.nanmedian,
+    'sum': np.nansum,
+    'min': np.nanmin,
+    'max': np.nanmax,
+    'std': np.nanstd,
+}
+
+
+def parse_number(value):
+    """
+    Parse a stat the API sends as a string
+
+    :param value: A string like "1.12", "52" or "1,234", or a list of them like the "Recent Results" of a player
+    :return: The number as a float (the mean for a list), or None if the value is not numeric
+    """
+
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return float(value)
+    if isinstance(value, str):
+        try:
+            return float(value)
+        except ValueError:
+            try:
+                return float(value.replace(',', ''))
+            except ValueError:
+                return None
+    if isinstance(value, list) and value:
+        numbers = [parse_number(item) for item in value]
+        if None not in numbers:
+            return sum(numbers) / len(numbers)
+    return None
+
+
+class StatsTable:
+    """
+    Numeric stats of many players or teams, parsed once into a (field, map, entity) array of floats
+
+    Missing stats are NaN and every query skips them. The lifetime stats are the map named LIFETIME.
+    """
+
+    def __init__(self, entities, maps, fields, values, mode=None):
+        """
+        Constructor Keyword arguments:
+
+        :param entities: The list of player or team IDs, in the order of the last axis of values
+        :param maps: The list of map names, in the order of the second axis of values
+        :param fields: The list of stat names, in the order of the first axis of values
+        :param values: A float array of shape (len(fields), len(maps), len(entities))
+        :param mode: The mode of the segments the maps come from, e.g. '5v5' (default is None, unknown)
+        """
+
+        self.entities = entities
+        self.maps = maps
+        self.fields = fields
+        self.values = values
+        self.mode = mode
+        self.entity_index = {entity: i for i, entity in enumerate(entities)}
+        self.map_index = {name: i for i, name in enumerate(maps)}
+        self.field_index = {name: i for i, name in enumerate(fields)}
+
+    def __len__(self):
+        return len(self.entities)
+
+    @classmethod
+    def from_stats(cls, stats, segment_type='Map', mode=None):
+        """
+        Build a table from player_stats or team_stats responses
+
+        :param stats: An iterable of (entity_id, response) tuples
+        :param segment_type: The type of the segments kept as maps (default 'Map')
+        :param mode: Only keep segments of this mode, e.g. '5v5'. The segments of other modes use the same map names,
+            so only one mode can be kept (default is None, the most common mode of the segments)
+        :return: A StatsTable
+        """
+
+        stats = [(entity_id, response) for entity_id, response in stats if response]
+        if mode is None:
+            modes = Counter(segment.get('mode') for _, response in stats for segment in response.get('segments') or ()
+                            if segment_type is None or segment.get('type') == segment_type)
+            if modes:
+                mode = modes.most_common(1)[0][0]
+
+        entities, maps, fields = [], {LIFETIME: 0}, {}
+        entity_index = {}
+        indexes, numbers = array('q'), array('d')
+
+        def add(entity, map_name, values):
+            m = maps.setdefault(map_name, len(maps))
+            for name, value in values.items():
+                number = parse_number(value)
+                if number is not None:
+                    f = fields.setdefault(name, len(fields))
+                    indexes.extend((f, m, entity))
+                    numbers.append(number)
+
+        for entity_id, response in stats:
+            entity = entity_index.get(entity_id)
+            if entity is None:
+                entity = entity_index[entity_id] = len(entities)
+                entities.append(entity_id)
+            add(entity, LIFETIME, response.get('lifetime') or {})
+            for segment in response.get('segments') or ():
+                if segment_type is not None and segment.get('type') != segment_type:
+                    continue
+                if mode is not None and segment.get('mode') != mode:
+                    continue
+                add(entity, segment.get('label'), segment.get('stats') or {})
+
+        values = np.full((len(fields), len(maps), len(entities)), np.nan)
+        if numbers:
+            f, m, e = np.frombuffer(indexes, dtype=np.int64).reshape(-1, 3).T
+            values[f, m, e] = np.frombuffer(numbers, dtype=np.float64)
+        return cls(entities, list(maps), list(fields), values, mode)
+
+    @classmethod
+    def fetch_players(cls, faceit_data, player_ids, game_id, max_workers=8, **kwargs):
+        """
+        Fetch player_stats for many players concurrently and build a table
+
+        :param faceit_data: A FaceitData client
+        :param player_ids: An iterable of player IDs
+        :param game_id: The ID of the game, e.g. 'cs2'
+        :param max_workers: The number of requests in flight (default 8)
+        :param kwargs: Passed on to from_stats
+        :return: A (StatsTable, failed) tuple, failed being a dict of player ID to the Result of the failed request
+        """
+
+        return cls._fetch(faceit_data, 'player_stats', player_ids, game_id, max_workers, kwargs)
+
+    @classmethod
+    def fetch_teams(cls, faceit_data, team_ids, game_id, max_workers=8, **kwargs):
+        """
+        Fetch team_stats for many teams concurrently and build a table, see fetch_players
+        """
+
+        return cls._fetch(faceit_data, 'team_stats', team_ids, game_id, max_workers, kwargs)
+
+    @classmethod
+    def _fetch(cls, faceit_data, endpoint, entity_ids, game_id, max_workers, kwargs):
+        entity_ids = list(dict.fromkeys(entity_ids))
+        results = faceit_data.with_results().batch(endpoint, [(entity_id, game_id) for entity_id in entity_ids],
+                                                   max_workers)
+        failed = {entity_id: result for entity_id, result in zip(entity_ids, results) if not result.ok}
+        stats = ((entity_id, result.data) for entity_id, result in zip(entity_ids, results) if result.ok)
+        return cls.from_stats(stats, **kwargs), failed
+
+    def column(self, field, map_name=LIFETIME):
+        """
+        :param field: A stat name, e.g. 'K/D Ratio' or 'Win Rate %'
+        :param map_name: A map name, or None for every map (default is the lifetime stats)
+        :return: A view of the values per entity, of shape (len(maps), len(entities)) if map_name is None
+        """
+
+        values = self.values[self._field(field)]
+        return values if map_name is None else values[self._map(map_name)]
+
+    def get(self, entity_id, field, map_name=LIFETIME):
+        """
+        :return: The stat of one entity, NaN if it has none
+        """
+
+        return float(self.values[self._field(field), self._map(map_name), self.entity_index[entity_id]])
+
+    def group_by(self, field, by='map', agg='mean'):
+        """
+        Aggregate a stat per map (over the entities) or per entity (over the maps, without the lifetime stats)
+
+        :param field: A stat name
+        :param by: 'map' or 'entity' (default 'map')
+        :param agg: 'mean', 'median', 'sum', 'min', 'max', 'std' or 'count' (default 'mean')
+        :return: A dict of map name or entity ID to the aggregate, NaN where there were no values
+        """
+
+        values = self.column(field, None)
+        if by == 'map':
+            keys, axis = self.maps, 1
+        elif by == 'entity':
+            keys, axis = self.entities, 0
+            values = np.delete(values, self.map_index[LIFETIME], axis=0)
+            if not len(values):
+                return dict.fromkeys(keys, float('nan'))
+        else:
+            raise ValueError('by must be "map" or "entity", not "{}"'.format(by))
+
+        if agg == 'count':
+            aggregated = np.count_nonzero(~np.isnan(values), axis=axis)
+        else:
+            function = AGGREGATES.get(agg)
+            if function is None:
+                raise ValueError('Unknown aggregate "{}"'.format(agg))
+            # All-NaN slices come back as NaN, numpy warns about them too
+            with warnings.catch_warnings():
+                warnings.simplefilter('ignore', RuntimeWarning)
+                aggregated = function(values, axis=axis)
+            if agg == 'sum':
+                # nansum makes 0 of an all-NaN slice
+                aggregated = np.where(np.isnan(values).all(axis=axis), np.nan, aggregated)
+        return dict(zip(keys, aggregated.tolist()))
+
+    def ratio(self, numerator, denominator, by='map'):
+        """
+        Divide the sum of one stat by the sum of another, e.g. the pooled win rate of a map is ratio('Wins', 'Matches')
+
+        :param by: 'map' or 'entity', see group_by
+        :return: A dict of map name or entity ID to the ratio, NaN where the denominator is 0
+        """
+
+        top = self.group_by(numerator, by, 'sum')
+        bottom = self.group_by(denominator, by, 'sum')
+        return {key: top[key] / bottom[key] if bottom[key] else float('nan') for key in top}
+
+    def rank(self, field, map_name=LIFETIME, descending=True, limit=None, min_matches=0, matches_field='Matches'):
+        """
+        Rank the entities by a stat on one map
+
+        :param field: A stat name
+        :param map_name: A map name (default is the lifetime stats)
+        :param descending: Highest first (default True)
+        :param limit: Only return the top entities (default is None, all of them)
+        :param min_matches: Skip entities with fewer matches on that map (default 0)
+        :param matches_field: The stat holding the number of matches (default 'Matches')
+        :return: A list of (entity_id, value) tuples, entities without the stat are left out
+        """
+
+        values = self.column(field, map_name)
+        keep = ~np.isnan(values)
+        if min_matches:
+            keep &= self.column(matches_field, map_name) >= min_matches
+        candidates = np.flatnonzero(keep)
+        order = np.argsort(-values[candidates] if descending else values[candidates], kind='stable')
+        if limit is not None:
+            order = order[:limit]
+        chosen = candidates[order]
+        return list(zip([self.entities[i] for i in chosen.tolist()], values[chosen].tolist()))
+
+    def percentile(self, field, q, map_name=LIFETIME):
+        """
+        :param field: A stat name
+        :param q: A percentile between 0 and 100, or a sequence of them
+        :param map_name: A map name, or None for the percentiles of every map (default is the lifetime stats)
+        :return: The value of the stat at that percentile of the entities
+        """
+
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', RuntimeWarning)
+            result = np.nanpercentile(self.column(field, map_name), q, axis=-1)
+        return result.tolist() if isinstance(result, np.ndarray) else float(result)
+
+    def percentile_ranks(self, field, map_name=LIFETIME):
+        """
+        :return: An array of the percentile (0 to 100) of each entity for a stat on one map, NaN where it has none
+        """
+
+        values = self.column(field, map_name)
+        present = ~np.isnan(values)
+        count = np.count_nonzero(present)
+        ranks = np.full(len(values), np.nan)
+        if count:
+            sorted_values = np.sort(values[present])
+            ranks[present] = np.searchsorted(sorted_values, values[present], side='right') * 100.0 / count
+        return ranks
+
+    def _field(self, field):
+        index = self.field_index.get(field)
+        if index is None:
+            raise KeyError('Unknown stat "{}"'.format(field))
+        return index
+
+    def _map(self, map_name):
+        index = self.map_index.get(map_name)
+        if index is None:
+            raise KeyError('Unknown map "{}"'.format(map_name))
+        return index
+
@@ -0,0 +1,219 @@
+import threading
+import time
+
+# httpx trace events to the phases reported to the trace callback, the http11./http2. prefix is dropped
+HTTPX_PHASES = {
+    'connection.connect_tcp': 'connect',
+    'connection.start_tls': 'tls',
+    'send_request_headers': 'send',
+    'send_request_body': 'send',
+    'receive_response_headers': 'wait',
+    'receive_response_body': 'body',
+}
+
+
+class RequestsTransport:
+    """HTTP/1.1 through a pooled requests Session, one connection per request in flight"""
+
+    name = 'requests'
+
+    def __init__(self, pool_maxsize=10):
+        """
+        Constructor Keyword arguments:
+
+        :param pool_maxsize: The number of connections kept open to the API (default 10)
+        """
+
+        import requests
+        import urllib3
+        from requests.adapters import HTTPAdapter
+
+        # Reading the raw body of a streamed response raises urllib3's errors, requests does not wrap them
+        self.errors = (requests.RequestException, urllib3.exceptions.HTTPError)
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_maxsize)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+    def get(self, url, headers, timeout, compressed=False, trace=None):
+        """
+        Send a GET request
+
+        :param url: The URL
+        :param headers: The request headers
+        :param timeout: The (connect, read) timeout in seconds
+        :param compressed: Return the body exactly as transferred instead of decompressing it (default False)
+        :param trace: A callable called as trace(phase, started, ended) with perf_counter times for the phases of
+            the request, 'headers' (connect, send and server wait) and 'body' here (default is None)
+        :return: A (status, headers, body) tuple, headers is a case insensitive mapping
+        """
+
+        if trace is not None:
+            return self._get_traced(url, headers, timeout, compressed, trace)
+
+        if compressed:
+            res = self.session.get(url, headers=headers, timeout=timeout, stream=True)
+            try:
+                if res.status_code == 200:
+                    return res.status_code, res.headers, res.raw.read(decode_content=False)
+                return res.status_code, res.headers, None
+            finally:
+                res.close()
+
+        res = self.session.get(url, headers=headers, timeout=timeout)
+        return res.status_code, res.headers, res.content
+
+    def close(self):
+        self.session.close()
+
+    def _get_traced(self, url, headers, timeout, compressed, trace):
+        # Streaming splits the time to the response headers from the time spent reading the body
+        started = time.perf_counter()
+        res = self.session.get(url, headers=headers, timeout=timeout, stream=True)
+        received = time.perf_counter()
+        try:
+            if not compressed:
+                body = res.content
+            elif res.status_code == 200:
+                body = res.raw.read(decode_content=False)
+            else:
+                body = None
+        finally:
+            res.close()
+        trace('headers', started, received)
+        trace('body', received, time.perf_counter())
+        return res.status_code, res.headers, body
+
+
+class HTTPXTransport:
+    """
+    HTTP/2 through httpx, many requests in flight are multiplexed over a few connections
+
+    The sync httpx client is not safe to share between threads over HTTP/2, so the requests run on an httpx AsyncClient
+    in an event loop thread of the transport and the calling threads wait on them.
+    """
+
+    name = 'http2'
+
+    def __init__(self, http2=True, http1=True, max_connections=10):
+        """
+        Constructor Keyword arguments:
+
+        :param http2: Negotiate HTTP/2 (default True, needs `pip install httpx[http2]`)
+        :param http1: Allow HTTP/1.1, set to False to speak HTTP/2 with prior knowledge to a cleartext http:// server
+            (default True)
+        :param max_connections: The maximum number of connections to the API (default 10)
+        """
+
+        import asyncio
+
+        import httpx
+
+        self._asyncio = asyncio
+        self._httpx = httpx
+        self.errors = (httpx.HTTPError,)
+        self._timeouts = {}
+
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name='faceit-http2', daemon=True)
+        self._thread.start()
+        self.client = self._run(self._open(http2, http1, max_connections))
+
+    def get(self, url, headers, timeout, compressed=False, trace=None):
+        """
+        Send a GET request, see RequestsTransport.get. The trace phases are 'connect' (DNS and TCP), 'tls', 'send',
+        'wait' (for the response headers) and 'body'
+        """
+
+        return self._run(self._get(url, headers, self._timeout(timeout), compressed, trace))
+
+    def close(self):
+        if self._loop.is_closed():
+            return
+        try:
+            self._run(self.client.aclose())
+        finally:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join()
+            self._loop.close()
+
+    def _run(self, coroutine):
+        return self._asyncio.run_coroutine_threadsafe(coroutine, self._loop).result()
+
+    async def _open(self, http2, http1, max_connections):
+        # Made in the loop thread, the client belongs to its loop
+        return self._httpx.AsyncClient(http2=http2, http1=http1,
+                                       limits=self._httpx.Limits(max_connections=max_connections))
+
+    async def _get(self, url, headers, timeout, compressed, trace):
+        extensions = None if trace is None else {'trace': _httpx_tracer(trace)}
+        if compressed:
+            async with self.client.stream('GET', url, headers=headers, timeout=timeout, extensions=extensions) as res:
+                if res.status_code == 200:
+                    return res.status_code, res.headers, b''.join([chunk async for chunk in res.aiter_raw()])
+                return res.status_code, res.headers, None
+
+        res = await self.client.get(url, headers=headers, timeout=timeout, extensions=extensions)
+        return res.status_code, res.headers, res.content
+
+    def _timeout(self, timeout):
+        return httpx_timeout(self._httpx, timeout, self._timeouts)
+
+
+def httpx_timeout(httpx, timeout, cache):
+    """
+    Convert a requests style timeout to an httpx.Timeout
+
+    :param httpx: The httpx module
+    :param timeout: A (connect, read) tuple or a number of seconds
+    :param cache: A dict the conversions are kept in, each timeout is only converted once
+    :return: An httpx.Timeout
+    """
+
+    timeouts = cache.get(timeout)
+    if timeouts is None:
+        if isinstance(timeout, tuple):
+            connect, read = timeout
+            timeouts = httpx.Timeout(read, connect=connect)
+        else:
+            timeouts = httpx.Timeout(timeout)
+        timeouts = cache.setdefault(timeout, timeouts)
+    return timeouts
+
+
+def _httpx_tracer(trace):
+    started = {}
+
+    # The async client awaits its trace callback
+    async def callback(event_name, info):
+        name, _, state = event_name.rpartition('.')
+        phase = HTTPX_PHASES.get(name) or HTTPX_PHASES.get(name.partition('.')[2])
+        if phase is None:
+            return
+        if state == 'started':
+            started[name] = time.perf_counter()
+        elif name in started:
+            trace(phase, started.pop(name), time.perf_counter())
+
+    return callback
+
+
+TRANSPORTS = {
+    RequestsTransport.name: RequestsTransport,
+    HTTPXTransport.name: HTTPXTransport,
+}
+
+
+def make_transport(transport):
+    """
+    Get a transport instance
+
+    :param transport: A transport instance, or the name of one in TRANSPORTS ('requests' or 'http2')
+    :return: The transport
+    """
+
+    if isinstance(transport, str):
+        if transport not in TRANSPORTS:
+            raise ValueError('Unknown transport "{}", expected one of {}'.format(transport, sorted(TRANSPORTS)))
+        return TRANSPORTS[transport]()
+    return transport
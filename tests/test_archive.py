@@ -0,0 +1,49 @@
+import json
+import math
+
+import pytest
+
+from faceit_data.archive import ArchiveWriter, MatchArchive
+
+
+def _stats(kills):
+    return {'rounds': [{'teams': [{'players': [
+        {'player_id': 'p1', 'player_stats': {'Kills': str(kills), 'Result': '1'}},
+        {'player_id': 'p2', 'player_stats': {'Kills': str(kills + 1), 'Deaths': 'n/a'}},
+    ]}]}]}
+
+
+def test_round_trip(tmp_path):
+    with ArchiveWriter(str(tmp_path)) as writer:
+        writer.add('m1', {'match_id': 'm1', 'finished_at': 10}, _stats(5))
+        writer.add('m2', json.dumps({'match_id': 'm2'}).encode(), json.dumps(_stats(7)).encode())
+        writer.add('m3', {'match_id': 'm3'})
+
+    with MatchArchive(str(tmp_path)) as archive:
+        assert len(archive) == 3
+        assert archive.details('m2') == {'match_id': 'm2'}
+        assert archive.stats('m1') == _stats(5)
+        assert archive.stats('m3') is None
+        rows = archive.player_stats('m2')
+        assert rows['kills'].tolist() == [7.0, 8.0]
+        assert math.isnan(rows['deaths'][1])
+        assert archive.column('kills').tolist() == [5.0, 6.0, 7.0, 8.0]
+        assert archive.match_ids().tolist() == [b'm1', b'm1', b'm2', b'm2']
+
+
+def test_writers_with_the_same_name_do_not_share_segments(tmp_path):
+    with ArchiveWriter(str(tmp_path), name='w') as writer:
+        writer.add('m1', {'match_id': 'm1'}, _stats(1))
+    with ArchiveWriter(str(tmp_path), name='w') as writer:
+        writer.add('m2', {'match_id': 'm2'}, _stats(2))
+
+    with MatchArchive(str(tmp_path)) as archive:
+        assert archive.details('m1') == {'match_id': 'm1'}
+        assert archive.details('m2') == {'match_id': 'm2'}
+        assert archive.player_stats('m2')['kills'].tolist() == [2.0, 3.0]
+
+
+def test_match_id_longer_than_the_index_is_refused(tmp_path):
+    with ArchiveWriter(str(tmp_path)) as writer:
+        with pytest.raises(ValueError):
+            writer.add('m' * 49, {})
@@ -0,0 +1,40 @@
+from faceit_data.brackets import Bracket
+
+
+def _match(match_id, round_number, first, second, winner=None, position=None):
+    match = {'match_id': match_id, 'round': round_number, 'group': 1, 'status': 'FINISHED' if winner else 'CREATED',
+             'teams': {'faction1': {'faction_id': first}, 'faction2': {'faction_id': second}},
+             'results': {'winner': winner} if winner else {}}
+    if position is not None:
+        match['position'] = position
+    return match
+
+
+def test_matches_without_positions_are_linked_by_winner():
+    # In bracket order a plays b and c plays d, but the IDs sort the other way round
+    bracket = Bracket([
+        _match('m4', 1, 'a', 'b', winner='faction1'),
+        _match('m3', 1, 'c', 'd', winner='faction2'),
+        _match('m2', 1, 'e', 'f'),
+        _match('m1', 1, 'g', 'h'),
+        _match('m6', 2, 'd', 'a'),
+        _match('m5', 2, None, None),
+    ])
+
+    assert (bracket['m4'].next_match, bracket['m4'].next_slot) == ('m6', 'faction2')
+    assert (bracket['m3'].next_match, bracket['m3'].next_slot) == ('m6', 'faction1')
+    # Without a winner there is nothing to follow, rather than a guess
+    assert bracket['m2'].next_match is None
+    assert bracket['m1'].next_match is None
+    assert bracket.next_match('a').match_id == 'm6'
+
+
+def test_positioned_matches_are_linked_by_position():
+    bracket = Bracket([
+        _match('m4', 1, 'a', 'b', position=1),
+        _match('m3', 1, 'c', 'd', position=2),
+        _match('m5', 2, None, None, position=1),
+    ])
+
+    assert (bracket['m4'].next_match, bracket['m4'].next_slot) == ('m5', 'faction1')
+    assert (bracket['m3'].next_match, bracket['m3'].next_slot) == ('m5', 'faction2')
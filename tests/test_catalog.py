@@ -0,0 +1,53 @@
+import json
+import os
+import threading
+import time
+from urllib.parse import urlparse
+
+from faceit_data import FaceitData
+from faceit_data.catalog import Catalog
+
+
+class _GamesTransport:
+    """Serves two games slowly, so refreshes that are not serialized overlap"""
+
+    errors = (OSError,)
+
+    def __init__(self):
+        self.paths = []
+        self._lock = threading.Lock()
+
+    def get(self, url, headers, timeout, compressed=False):
+        path = urlparse(url).path[len('/data/v4'):]
+        with self._lock:
+            self.paths.append(path)
+        time.sleep(0.05)
+        if path == '/games':
+            return 200, {}, json.dumps({'items': [{'game_id': 'cs2'}, {'game_id': 'dota2'}]}).encode()
+        if path.endswith('/parent'):
+            return 404, {}, b''
+        return 200, {}, json.dumps({'game_id': path.split('/')[2], 'regions': ['EU']}).encode()
+
+
+def test_cold_start_refreshes_once(tmp_path):
+    transport = _GamesTransport()
+    faceit_data = FaceitData('token', transport=transport, negative_cache_ttl=0)
+    path = str(tmp_path / 'catalog.json')
+
+    # The background thread and a lookup both find no snapshot, a second catalog stands in for another process
+    catalog = faceit_data.catalog(path)
+    other = Catalog(faceit_data, path)
+    lookups = [threading.Thread(target=other.game, args=('cs2',)) for _ in range(2)]
+    for thread in lookups:
+        thread.start()
+    try:
+        assert catalog.game('cs2') == {'game_id': 'cs2', 'regions': ['EU']}
+    finally:
+        for thread in lookups:
+            thread.join()
+        catalog.stop()
+
+    assert transport.paths.count('/games') == 1
+    assert transport.paths.count('/games/cs2') == 1
+    assert other.game('dota2') == catalog.game('dota2')
+    assert sorted(os.listdir(str(tmp_path))) == ['catalog.json', 'catalog.json.lock']
@@ -0,0 +1,32 @@
+import os
+
+import pytest
+
+from faceit_data.cli import ExportError, ParquetWriter
+
+pyarrow = pytest.importorskip('pyarrow')
+parquet = pytest.importorskip('pyarrow.parquet')
+
+
+def test_parquet_schema_widens_across_row_groups(tmp_path):
+    path = str(tmp_path / 'out.parquet')
+    writer = ParquetWriter(path, row_group_size=2)
+    writer.write([{'id': 1, 'country': None}, {'id': 2, 'country': None}])
+    writer.write([{'id': 3, 'country': 'fr'}, {'id': 4, 'country': 'de', 'elo': 2100}])
+    writer.write([{'id': 5}])
+    writer.close()
+
+    table = parquet.read_table(path)
+    assert table.column_names == ['id', 'country', 'elo']
+    assert table.schema.field('country').type == pyarrow.string()
+    assert table.to_pylist()[3] == {'id': 4, 'country': 'de', 'elo': 2100}
+    assert table.column('country').to_pylist() == [None, None, 'fr', 'de', None]
+    assert os.listdir(str(tmp_path)) == ['out.parquet']
+    assert writer.bytes == os.path.getsize(path)
+
+
+def test_parquet_conflicting_types_raise_an_export_error(tmp_path):
+    writer = ParquetWriter(str(tmp_path / 'out.parquet'), row_group_size=1)
+    writer.write([{'id': 1}])
+    with pytest.raises(ExportError):
+        writer.write([{'id': 'one'}])
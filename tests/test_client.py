@@ -0,0 +1,78 @@
+import asyncio
+import json
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+from faceit_data import FaceitData
+
+# Three pages of hub members, the last one short
+MEMBERS = [{'user_id': 'user{}'.format(i)} for i in range(5)]
+PAGE_SIZE = 2
+
+
+def _page(url):
+    query = parse_qs(urlparse(url).query)
+    offset = int(query['offset'][0])
+    return json.dumps({'items': MEMBERS[offset:offset + int(query['limit'][0])]}).encode()
+
+
+class _ScriptedTransport:
+    """Answers each request with the next status of a script, 200 once the script is used up"""
+
+    errors = (OSError,)
+
+    def __init__(self, statuses):
+        self.statuses = list(statuses)
+        self.offsets = []
+
+    def get(self, url, headers, timeout, compressed=False):
+        self.offsets.append(int(parse_qs(urlparse(url).query)['offset'][0]))
+        status = self.statuses.pop(0) if self.statuses else 200
+        if status != 200:
+            return status, {'retry-after': '0'}, b''
+        return 200, {}, _page(url)
+
+
+def test_rate_limit_mid_iteration_is_retried():
+    transport = _ScriptedTransport([200, 429])
+    faceit_data = FaceitData('token', transport=transport)
+
+    assert list(faceit_data.iter_hub_members('hub_id', return_items=PAGE_SIZE)) == MEMBERS
+    # The second page was asked for twice
+    assert transport.offsets == [0, 2, 2, 4]
+
+
+def test_persistent_server_error_mid_iteration_raises():
+    transport = _ScriptedTransport([200, 503, 503, 503])
+    faceit_data = FaceitData('token', transport=transport)
+
+    members = faceit_data.iter_hub_members('hub_id', return_items=PAGE_SIZE)
+    assert [next(members), next(members)] == MEMBERS[:2]
+    with pytest.raises(RuntimeError):
+        next(members)
+
+
+def test_async_rate_limit_mid_iteration_is_retried():
+    httpx = pytest.importorskip('httpx')
+    from faceit_data import AsyncFaceitData
+
+    statuses = [200, 429]
+
+    def handler(request):
+        status = statuses.pop(0) if statuses else 200
+        if status != 200:
+            return httpx.Response(status, headers={'retry-after': '0'})
+        return httpx.Response(200, content=_page(str(request.url)))
+
+    async def collect(faceit_data):
+        faceit_data._get_client()
+        faceit_data._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        async with faceit_data:
+            return [member async for member in faceit_data.iter_hub_members('hub_id', return_items=PAGE_SIZE)]
+
+    assert asyncio.run(collect(AsyncFaceitData('token'))) == MEMBERS
+
+    statuses[:] = [200, 503, 503, 503]
+    with pytest.raises(RuntimeError):
+        asyncio.run(collect(AsyncFaceitData('token')))
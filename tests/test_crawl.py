@@ -0,0 +1,126 @@
+import json
+import multiprocessing
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from faceit_data import crawl, result
+from faceit_data.crawl import CrawlCoordinator, CrawlJournal
+
+pytestmark = pytest.mark.skipif('fork' not in multiprocessing.get_all_start_methods(),
+                                reason='the crawl test patches the client in the parent process')
+
+
+class _Handler(BaseHTTPRequestHandler):
+    # Set by the tests to make the API fail
+    status = 200
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        if self.status != 200:
+            self.send_response(self.status)
+            self.send_header('content-length', '0')
+            self.end_headers()
+            return
+        body = json.dumps({'path': self.path}).encode()
+        self.send_response(200)
+        self.send_header('content-length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+@pytest.fixture
+def base_url(monkeypatch):
+    server = ThreadingHTTPServer(('127.0.0.1', 0), _Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = 'http://127.0.0.1:{}/data/v4'.format(server.server_address[1])
+
+    class StubFaceitData(crawl.FaceitData):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            self.base_url = url
+
+    monkeypatch.setattr(crawl, 'FaceitData', StubFaceitData)
+    monkeypatch.setattr(crawl.multiprocessing, 'Process', multiprocessing.get_context('fork').Process)
+    yield url
+    _Handler.status = 200
+    server.shutdown()
+    server.server_close()
+
+
+def _crash_on_poison(faceit_data, kind, item_id, data):
+    if item_id == 'poison':
+        os._exit(1)
+    return ()
+
+
+def test_item_that_kills_its_worker_is_failed(tmp_path, base_url):
+    coordinator = CrawlCoordinator('token', str(tmp_path / 'journal.db'), handler=_crash_on_poison, processes=2,
+                                   rate=1000, burst=10, max_attempts=3, idle_delay=0.05)
+    coordinator.add('player', ['p{}'.format(i) for i in range(20)] + ['poison'])
+
+    counts = coordinator.run()
+
+    assert counts == {'pending': 0, 'claimed': 0, 'done': 20, 'failed': 1}
+    states = dict(coordinator.journal.connection.execute('SELECT item_id, state FROM items').fetchall())
+    assert states['poison'] == crawl.FAILED
+
+
+def test_crawl_stops_after_max_restarts(tmp_path, base_url):
+    coordinator = CrawlCoordinator('token', str(tmp_path / 'journal.db'), handler=_crash_on_poison, processes=1,
+                                   rate=1000, burst=10, max_attempts=100, idle_delay=0.05, max_restarts=2)
+    coordinator.add('player', ['poison'])
+
+    with pytest.raises(RuntimeError):
+        coordinator.run()
+
+
+def test_release_counts_attempts(tmp_path):
+    journal = CrawlJournal(str(tmp_path / 'journal.db'))
+    journal.add([('player', 'a'), ('player', 'b')])
+    assert len(journal.claim(1, 10)) == 2
+
+    assert journal.release(1, max_attempts=2) == 2
+    assert journal.counts()['pending'] == 2
+    # A retried item is claimed on its own
+    assert journal.claim(1, 10) == [('player', 'a')]
+    journal.release(1, max_attempts=2)
+    assert journal.counts() == {'pending': 1, 'claimed': 0, 'done': 0, 'failed': 1}
+
+    # Releasing the claims of a previous run does not count as an attempt
+    journal.claim(2, 10)
+    journal.release()
+    assert journal.counts()['pending'] == 1
+
+
+def test_outage_does_not_lose_items(tmp_path, base_url, monkeypatch):
+    # Keeps the backoff of the workers short
+    monkeypatch.setattr(result, 'MAX_RETRY_AFTER', 0.05)
+    journal_path = str(tmp_path / 'journal.db')
+    coordinator = CrawlCoordinator('token', journal_path, processes=2, rate=1000, burst=10, idle_delay=0.05,
+                                   max_transient_attempts=2, retry_delay=0.01)
+    coordinator.add('match', ['m{}'.format(i) for i in range(20)])
+
+    _Handler.status = 503
+    assert coordinator.run() == {'pending': 0, 'claimed': 0, 'done': 0, 'failed': 20}
+    # A 503 is not charged against max_attempts
+    assert coordinator.journal.connection.execute('SELECT MAX(attempts) FROM items').fetchone()[0] == 0
+
+    # Resuming once the API is back picks the items up again
+    _Handler.status = 200
+    assert coordinator.run() == {'pending': 0, 'claimed': 0, 'done': 20, 'failed': 0}
+
+
+def test_permanent_failures_are_not_requeued(tmp_path):
+    journal = CrawlJournal(str(tmp_path / 'journal.db'))
+    journal.add([('match', 'missing'), ('match', 'busy')])
+    journal.claim(1, 10)
+    journal.fail('match', 'missing', 3, permanent=True)
+    journal.fail('match', 'busy', 1, transient=True)
+
+    assert journal.requeue_failed() == 1
+    assert journal.claim(1, 10) == [('match', 'busy')]
@@ -0,0 +1,32 @@
+import pytest
+
+from faceit_data.profiling import Profiler
+
+
+def test_summary_memory_is_bounded():
+    profiler = Profiler(max_events=10, max_samples=100)
+    for i in range(1, 10001):
+        with profiler._lock:
+            profiler._count('process', i / 10000, 'process')
+
+    stats = profiler.durations['process']
+    assert len(stats.samples) == 100
+    summary = profiler.summary()['process']
+    # Exact whatever the sample
+    assert summary['count'] == 10000
+    assert summary['total'] == pytest.approx(5000.5)
+    assert summary['mean'] == pytest.approx(0.50005)
+    assert summary['max'] == 1.0
+    # Estimated from a uniform sample of the durations
+    assert 0.3 < summary['p50'] < 0.7
+    assert 0.85 < summary['p95'] <= 1.0
+
+
+def test_summary_is_exact_below_max_samples():
+    profiler = Profiler(max_samples=100)
+    with profiler._lock:
+        for i in range(1, 21):
+            profiler._count('process', i, 'process')
+
+    summary = profiler.summary()['process']
+    assert (summary['count'], summary['p50'], summary['p95'], summary['max']) == (20, 11, 20, 20)
@@ -0,0 +1,66 @@
+import asyncio
+import time
+
+import pytest
+
+from faceit_data import CircuitBreaker, CircuitOpenError, FaceitData
+
+
+class _BrokenTransport:
+    """Fails with an error the client does not know about"""
+
+    errors = (OSError,)
+
+    def get(self, url, headers, timeout, compressed=False):
+        raise RuntimeError('bug in a custom transport')
+
+
+def _half_open_breaker():
+    breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=0.05)
+    breaker.record_failure()
+    time.sleep(0.06)
+    return breaker
+
+
+def test_unexpected_error_releases_the_trial():
+    breaker = _half_open_breaker()
+    faceit_data = FaceitData('token', transport=_BrokenTransport(), circuit_breaker=breaker).with_results()
+
+    with pytest.raises(RuntimeError):
+        faceit_data.match_details('match_id')
+    assert breaker.state == 'half-open'
+    # The slot is free again, the next call is a trial instead of being refused
+    assert breaker.before_request() is True
+
+
+def test_lost_trial_expires_after_recovery_timeout():
+    breaker = _half_open_breaker()
+    assert breaker.before_request() is True
+    with pytest.raises(CircuitOpenError):
+        breaker.before_request()
+
+    time.sleep(0.06)
+    assert breaker.before_request() is True
+
+
+def test_cancelled_async_trial_releases_the_slot():
+    httpx = pytest.importorskip('httpx')
+    from faceit_data import AsyncFaceitData
+
+    async def handler(request):
+        await asyncio.sleep(10)
+
+    async def main():
+        breaker = _half_open_breaker()
+        faceit_data = AsyncFaceitData('token', circuit_breaker=breaker, return_results=True)
+        faceit_data._get_client()
+        faceit_data._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+        task = asyncio.ensure_future(faceit_data.match_details('match_id'))
+        await asyncio.sleep(0.01)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        return breaker.before_request()
+
+    assert asyncio.run(main()) is True
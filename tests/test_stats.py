@@ -0,0 +1,42 @@
+import math
+
+from faceit_data.stats import StatsTable
+
+
+def _segment(label, mode, kd, matches):
+    return {'type': 'Map', 'label': label, 'mode': mode, 'stats': {'K/D Ratio': str(kd), 'Matches': str(matches)}}
+
+
+def _player(*segments, lifetime=None):
+    return {'lifetime': lifetime or {}, 'segments': list(segments)}
+
+
+def test_segments_of_another_mode_do_not_replace_the_main_mode():
+    stats = [
+        ('p1', _player(_segment('Mirage', '5v5', 1.5, 40), _segment('Mirage', '2v2', 0.5, 3))),
+        ('p2', _player(_segment('Mirage', '5v5', 1.1, 12))),
+    ]
+
+    table = StatsTable.from_stats(stats)
+
+    assert table.mode == '5v5'
+    assert table.get('p1', 'K/D Ratio', 'Mirage') == 1.5
+    assert table.get('p1', 'Matches', 'Mirage') == 40
+
+    wingman = StatsTable.from_stats(stats, mode='2v2')
+    assert wingman.get('p1', 'K/D Ratio', 'Mirage') == 0.5
+    assert math.isnan(wingman.get('p2', 'K/D Ratio', 'Mirage'))
+
+
+def test_sum_of_missing_values_is_nan():
+    stats = [
+        ('p1', _player(_segment('Mirage', '5v5', 1.5, 40), lifetime={'Wins': '20'})),
+        ('p2', _player(_segment('Mirage', '5v5', 1.1, 12), lifetime={'Wins': '5'})),
+    ]
+    table = StatsTable.from_stats(stats)
+
+    sums = table.group_by('Matches', by='map', agg='sum')
+    assert sums['Mirage'] == 52
+    assert math.isnan(sums['lifetime'])
+    # No lifetime matches, the lifetime win rate is unknown rather than 0
+    assert math.isnan(table.ratio('Wins', 'Matches')['lifetime'])
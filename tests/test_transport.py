@@ -0,0 +1,55 @@
+import os
+import subprocess
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from faceit_data import FaceitData
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+
+class _StallingHandler(BaseHTTPRequestHandler):
+    """Sends the headers and part of the body, then stalls"""
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header('content-length', '1000')
+        self.end_headers()
+        self.wfile.write(b'{"match_id":')
+        self.wfile.flush()
+        time.sleep(1)
+
+
+@pytest.fixture
+def stalling_url():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), _StallingHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield 'http://127.0.0.1:{}/data/v4'.format(server.server_address[1])
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.mark.parametrize('raw', [False, True, 'compressed'])
+def test_body_read_timeout_is_a_result(stalling_url, raw):
+    faceit_data = FaceitData('token', timeout=(1, 0.2), negative_cache_ttl=0).with_results()
+    faceit_data.base_url = stalling_url
+
+    result = faceit_data.match_details('match_id', raw=raw)
+
+    assert not result.ok
+    assert result.transient
+    assert result.error is not None
+
+
+def test_import_does_not_load_the_optional_modules():
+    code = 'import sys, faceit_data; print(sorted(m for m in ("asyncio", "httpx", "numpy") if m in sys.modules))'
+    output = subprocess.run([sys.executable, '-c', code], cwd=ROOT, capture_output=True, text=True, check=True).stdout
+    assert output.strip() == '[]'